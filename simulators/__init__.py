@@ -0,0 +1 @@
+"""NASCAR Monte Carlo race simulators - one module per track type"""
@@ -0,0 +1,294 @@
+"""
+Streaming aggregation of race results
+
+A RaceAccumulator folds batches of race results into running win counts,
+scenario-conditional win counts and online means/variances, so a run never
+has to hold one row per race. Memory is O(drivers) whatever the run size.
+"""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class RunningStat:
+    """Online mean / variance, merged batch-wise (Chan et al.); NaNs are skipped"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values) -> "RunningStat":
+        x = np.asarray(values)
+        batch = RunningStat()
+        if not x.size:
+            return self
+        if x.dtype.kind in "iu" and int(x.max()) - int(x.min()) < 4096:
+            # Counts take few distinct values: moments from a histogram, no float copy
+            low = int(x.min())
+            hist = np.bincount(np.subtract(x, low, dtype=np.intp).ravel())
+            levels = np.arange(low, low + hist.size, dtype=float)
+            batch.count = x.size
+            batch.mean = float(hist @ levels) / x.size
+            batch.m2 = float(hist @ (levels - batch.mean) ** 2)
+        else:
+            x = x.astype(float, copy=False).ravel()
+            nan = np.isnan(x)
+            if nan.any():
+                x = x[~nan]
+            if x.size:
+                batch.count = x.size
+                batch.mean = float(x.mean())
+                d = x - batch.mean
+                batch.m2 = float(d @ d)
+        return self.merge(batch)
+
+    def merge(self, other: "RunningStat") -> "RunningStat":
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+
+class RaceAccumulator:
+    """Running aggregates of a Monte Carlo run
+
+    conditions are boolean result columns (e.g. early_carnage) to keep
+    scenario-conditional win counts for; stats are numeric columns to keep
+    running mean/variance for.
+
+    rao_blackwell=True also sums each race's exact win-probability vector
+    over its surviving field (the 'win_probs' result column) - the
+    Rao-Blackwellized estimate, same mean as the sampled win share but with
+    far less variance. Win tables then report expected wins.
+
+    finishing_order=True counts every driver's finishing positions (from
+    the 'finishing_order' result column) into a drivers x positions matrix.
+    """
+
+    def __init__(self, drivers: Sequence, conditions: Sequence[str] = (),
+                 stats: Sequence[str] = (), rao_blackwell: bool = False,
+                 finishing_order: bool = False):
+        self.names = [d.name for d in drivers]
+        self.manufacturers = [getattr(d, "manufacturer", None) for d in drivers]
+        self.teams = [getattr(d, "team", None) for d in drivers]
+        self.tiers = [getattr(d, "tier", None) for d in drivers]
+        self._index = None  # pandas Index of names, built on the first update
+
+        self.n_races = 0
+        self.wins = np.zeros(len(self.names), dtype=np.int64)
+        self.condition_races = {c: 0 for c in conditions}
+        self.condition_wins = {c: np.zeros(len(self.names), dtype=np.int64) for c in conditions}
+        self.stats = {s: RunningStat() for s in stats}
+
+        self.rao_blackwell = rao_blackwell
+        if rao_blackwell:
+            self.prob_sum = np.zeros(len(self.names))
+            self.prob_sumsq = np.zeros(len(self.names))
+            self.condition_prob_sum = {c: np.zeros(len(self.names)) for c in conditions}
+
+        self.finishing_order = finishing_order
+        if finishing_order:
+            # positions[i, p] = races driver i finished in position p + 1
+            self.positions = np.zeros((len(self.names), len(self.names)), dtype=np.int64)
+
+    def update(self, results: Mapping) -> "RaceAccumulator":
+        """Fold in a batch of races - any mapping of result columns (dict of arrays, DataFrame)"""
+        import pandas as pd
+        if self._index is None:
+            self._index = pd.Index(self.names)
+        winner = results['winner']
+        if isinstance(getattr(winner, 'dtype', None), pd.CategoricalDtype):
+            # Map the few categories, then index by code - no per-row string hashing
+            cat = pd.Categorical(winner)
+            winners = self._index.get_indexer(cat.categories)[cat.codes]
+        else:
+            winners = self._index.get_indexer(np.asarray(winner, dtype=object))
+        if (winners < 0).any():
+            raise ValueError("Result batch has a winner that is not in the roster")
+        n = len(self.names)
+
+        self.n_races += winners.size
+        self.wins += np.bincount(winners, minlength=n)
+        for c in self.condition_races:
+            mask = np.asarray(results[c], dtype=bool)
+            # One pass: bins [n, 2n) count the winners of races where c held
+            split = np.bincount(winners + n * mask, minlength=2 * n)
+            self.condition_races[c] += int(split[n:].sum())
+            self.condition_wins[c] += split[n:]
+        for s, stat in self.stats.items():
+            stat.update(results[s])
+
+        if self.rao_blackwell:
+            probs = results['win_probs']
+            # A per-race frame holds one vector per row
+            probs = np.stack(list(probs)) if np.ndim(probs) == 1 else np.asarray(probs)
+            self.prob_sum += probs.sum(axis=0)
+            self.prob_sumsq += np.einsum('ij,ij->j', probs, probs)
+            for c in self.condition_prob_sum:
+                self.condition_prob_sum[c] += probs[np.asarray(results[c], dtype=bool)].sum(axis=0)
+
+        if self.finishing_order:
+            order = results['finishing_order']
+            order = np.stack(list(order)) if np.ndim(order) == 1 else np.asarray(order)
+            # One bincount over (driver, position) pairs
+            self.positions += np.bincount((order * n + np.arange(n)).ravel(),
+                                          minlength=n * n).reshape(n, n)
+        return self
+
+    def merge(self, other: "RaceAccumulator") -> "RaceAccumulator":
+        """Combine with an accumulator over the same roster (e.g. another worker's chunk)"""
+        if other.names != self.names:
+            raise ValueError("Cannot merge accumulators over different rosters")
+        self.n_races += other.n_races
+        self.wins += other.wins
+        for c in self.condition_races:
+            self.condition_races[c] += other.condition_races[c]
+            self.condition_wins[c] += other.condition_wins[c]
+        for s, stat in self.stats.items():
+            stat.merge(other.stats[s])
+        if self.rao_blackwell:
+            self.prob_sum += other.prob_sum
+            self.prob_sumsq += other.prob_sumsq
+            for c in self.condition_prob_sum:
+                self.condition_prob_sum[c] += other.condition_prob_sum[c]
+        if self.finishing_order:
+            self.positions += other.positions
+        return self
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The accumulator's configuration and state as named arrays (e.g. for
+        np.savez) - from_arrays rebuilds it"""
+        config = {
+            'names': self.names, 'manufacturers': self.manufacturers,
+            'teams': self.teams, 'tiers': self.tiers,
+            'conditions': list(self.condition_races), 'stats': list(self.stats),
+            'rao_blackwell': self.rao_blackwell, 'finishing_order': self.finishing_order,
+        }
+        arrays = {'config': np.array(json.dumps(config)), 'n_races': np.array(self.n_races),
+                  'wins': self.wins}
+        for c in self.condition_races:
+            arrays[f'condition_races.{c}'] = np.array(self.condition_races[c])
+            arrays[f'condition_wins.{c}'] = self.condition_wins[c]
+        for s, stat in self.stats.items():
+            arrays[f'stats.{s}'] = np.array([stat.count, stat.mean, stat.m2])
+        if self.rao_blackwell:
+            arrays['prob_sum'] = self.prob_sum
+            arrays['prob_sumsq'] = self.prob_sumsq
+            for c in self.condition_prob_sum:
+                arrays[f'condition_prob_sum.{c}'] = self.condition_prob_sum[c]
+        if self.finishing_order:
+            arrays['positions'] = self.positions
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, data: Mapping) -> "RaceAccumulator":
+        """Inverse of to_arrays - data is any mapping of its arrays (e.g. an open npz)"""
+        config = json.loads(str(data['config']))
+        drivers = [SimpleNamespace(name=name, manufacturer=mfg, team=team, tier=tier)
+                   for name, mfg, team, tier in zip(config['names'], config['manufacturers'],
+                                                    config['teams'], config['tiers'])]
+        acc = cls(drivers, config['conditions'], config['stats'], config['rao_blackwell'],
+                  config['finishing_order'])
+
+        acc.n_races = int(data['n_races'])
+        acc.wins = np.array(data['wins'])
+        for c in acc.condition_races:
+            acc.condition_races[c] = int(data[f'condition_races.{c}'])
+            acc.condition_wins[c] = np.array(data[f'condition_wins.{c}'])
+        for s, stat in acc.stats.items():
+            count, stat.mean, stat.m2 = (float(v) for v in data[f'stats.{s}'])
+            stat.count = int(count)
+        if acc.rao_blackwell:
+            acc.prob_sum = np.array(data['prob_sum'])
+            acc.prob_sumsq = np.array(data['prob_sumsq'])
+            for c in acc.condition_prob_sum:
+                acc.condition_prob_sum[c] = np.array(data[f'condition_prob_sum.{c}'])
+        if acc.finishing_order:
+            acc.positions = np.array(data['positions'])
+        return acc
+
+    def races(self, condition: Optional[str] = None, value: bool = True) -> int:
+        """Number of races, optionally only those where condition == value"""
+        if condition is None:
+            return self.n_races
+        hits = self.condition_races[condition]
+        return hits if value else self.n_races - hits
+
+    def win_counts(self, by: str = "winner", condition: Optional[str] = None,
+                   value: bool = True) -> pd.Series:
+        """Wins per driver (or manufacturer/team/tier), most wins first, winners only
+
+        With rao_blackwell these are expected wins (sums of win probabilities).
+        """
+        import pandas as pd
+        if self.rao_blackwell:
+            wins, conditional = self.prob_sum, self.condition_prob_sum
+        else:
+            wins, conditional = self.wins, self.condition_wins
+        if condition is not None:
+            wins = conditional[condition] if value else wins - conditional[condition]
+
+        labels = {
+            "winner": self.names,
+            "manufacturer": self.manufacturers,
+            "team": self.teams,
+            "tier": self.tiers,
+        }[by]
+        counts = pd.Series(wins, index=pd.Index(labels, name=by)).groupby(level=0, sort=False).sum()
+        counts = counts[counts > 0]
+        order = np.argsort(-counts.to_numpy(), kind="stable")
+        return counts.iloc[order]
+
+    def win_probability_se(self) -> pd.Series:
+        """Standard error of each driver's Rao-Blackwellized win probability"""
+        import pandas as pd
+        if not self.rao_blackwell:
+            raise ValueError("win_probability_se needs a rao_blackwell accumulator")
+        n = max(self.n_races, 1)
+        mean = self.prob_sum / n
+        var = np.maximum(self.prob_sumsq / n - mean ** 2, 0.0)
+        se = np.sqrt(var / max(n - 1, 1))
+        return pd.Series(se, index=pd.Index(self.names, name='winner'))
+
+    def position_probabilities(self) -> pd.DataFrame:
+        """P(driver finishes in position p), drivers x positions 1..n"""
+        import pandas as pd
+        if not self.finishing_order:
+            raise ValueError("position_probabilities needs a finishing_order accumulator")
+        return pd.DataFrame(self.positions / max(self.n_races, 1),
+                            index=pd.Index(self.names, name='driver'),
+                            columns=pd.RangeIndex(1, len(self.names) + 1, name='position'))
+
+    def finish_table(self) -> pd.DataFrame:
+        """Win, top-5 and top-10 probability and average finish per driver, best first"""
+        import pandas as pd
+        probs = self.position_probabilities()
+        cum = probs.cumsum(axis=1)
+        table = pd.DataFrame({
+            'win': probs[1],
+            'top5': cum[min(5, cum.shape[1])],
+            'top10': cum[min(10, cum.shape[1])],
+            'avg_finish': probs.to_numpy() @ probs.columns.to_numpy(),
+        }, index=probs.index)
+        return table.sort_values('avg_finish', kind="stable")
@@ -0,0 +1,323 @@
+"""
+Benchmark harness for the race simulators
+
+Times every simulator/engine pair at several run sizes and reports
+throughput (sims/sec), per-race latency percentiles, peak RSS and the peak
+of traced Python/NumPy allocations. Each case runs in a fresh interpreter so
+its peak RSS is its own. Results are written as JSON and can be checked
+against a baseline recorded on the same machine:
+
+    python -m simulators.benchmark --sizes 1000,10000 --save-baseline
+    python -m simulators.benchmark --sizes 1000,10000 --baseline benchmarks/baseline.json
+
+exits non-zero if any case got slower (or bigger) than the threshold allows.
+Everything runs locally - no network, no extra dependencies.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ENGINES = {
+    "atlanta": ("scalar", "events", "vectorized", "compiled", "parallel"),
+    "cota": ("scalar", "events", "vectorized", "compiled", "parallel"),
+    "phoenix": ("scalar", "vectorized", "counts", "parallel"),
+}
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+BATCH_SIZE = 50_000
+SEED = 12345
+
+# Allocation tracing slows a run several times over. Results are dropped as
+# they are produced, so one full batch already reaches the steady-state peak
+ALLOC_SIMS = BATCH_SIZE
+
+DEFAULT_OUT = os.path.join("benchmarks", "results.json")
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+
+def _batches(n: int, size: int) -> Iterator[int]:
+    done = 0
+    while done < n:
+        step = min(size, n - done)
+        yield step
+        done += step
+
+
+# track -> (module, roster, scalar simulator, batch simulator)
+_TRACKS = {
+    "atlanta": ("simulators.atlanta_recalibrated", "ATLANTA_DRIVERS",
+                "AtlantaRaceSimulator", "AtlantaBatchSimulator"),
+    "cota": ("simulators.cota_simulator", "COTA_DRIVERS",
+             "COTARaceSimulator", "COTABatchSimulator"),
+}
+
+
+def _race_units(track: str, engine: str, n: int, workers: int) -> Iterator[Tuple[int, float]]:
+    """Run n sims of one case, yielding (sims in unit, perf_counter at its end) per unit of work
+
+    A unit is one race for the scalar engines, one batch for the vectorized
+    ones and one worker chunk for the parallel runner. The first item,
+    (0, time), marks the end of setup (imports, rosters) so it stays off the clock.
+    """
+    from simulators.parallel import run_parallel
+    from simulators.roster import Roster
+    from simulators.rng import RaceRNG
+
+    rng = np.random.default_rng(SEED)
+
+    if track == "phoenix":
+        from simulators.phoenix import phoenix_v25_simulator as module
+
+        drivers = Roster(module.PHOENIX_DRIVERS)
+        chunk_task, chunk_args = module.simulate_chunk, ("vectorized",)
+        sim = module.PhoenixSimulator(drivers, RaceRNG(rng))
+        sim.win_probabilities()
+    else:
+        # The chunks use pandas - importing it here keeps it in setup, and
+        # out of every forked worker
+        import pandas  # noqa: F401
+        from simulators.engine import batch_simulator as compiled_simulator, simulate_chunk
+        from simulators.tracks import load_track
+
+        module_name, drivers, race_simulator, batch_simulator = _TRACKS[track]
+        module = importlib.import_module(module_name)
+        model, drivers = load_track(track)
+
+        # Vectorized chunks, streamed into accumulators so only aggregates cross processes
+        chunk_task, chunk_args = simulate_chunk, (model, drivers, "vectorized", BATCH_SIZE, None, True)
+        if engine == "vectorized":
+            sim = getattr(module, batch_simulator)(drivers, rng)
+        elif engine == "compiled":
+            # The vectorized engine (with a warning) when Numba is missing
+            sim = compiled_simulator(model, drivers, rng, "compiled")
+            sim.simulate_races(1)  # Keeps JIT compilation in setup
+        else:
+            roster = Roster(drivers)
+            race_rng = RaceRNG(rng)
+            race_simulator = getattr(module, race_simulator)
+
+    yield 0, time.perf_counter()
+
+    if engine == "parallel":
+        finished = []
+        run_parallel(chunk_task, n, workers=workers, seed=SEED, args=chunk_args,
+                     on_chunk_done=lambda done, total, _: finished.append((done, time.perf_counter())))
+        previous = 0
+        for done, at in finished:
+            yield done - previous, at
+            previous = done
+    elif track == "phoenix":
+        if engine == "counts":
+            sim.sample_win_counts(n)
+            yield n, time.perf_counter()
+        elif engine == "vectorized":
+            for size in _batches(n, BATCH_SIZE):
+                sim.sample_winners(size)
+                yield size, time.perf_counter()
+        else:
+            for _ in range(n):
+                module.PhoenixSimulator(drivers, sim.rng).simulate()
+                yield 1, time.perf_counter()
+    elif engine in ("vectorized", "compiled"):
+        for size in _batches(n, BATCH_SIZE):
+            sim.simulate_races(size)
+            yield size, time.perf_counter()
+    else:
+        for _ in range(n):
+            race_simulator(roster, race_rng).simulate_race(event_skipping=(engine == "events"))
+            yield 1, time.perf_counter()
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is KiB on Linux (bytes on macOS)
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(who).ru_maxrss * scale / 2**20
+
+
+def run_case(track: str, engine: str, n: int, workers: int, allocations: bool = True) -> Dict:
+    """Time one case in this process and return its result record"""
+    units = _race_units(track, engine, n, workers)
+    _, start = next(units)
+    # Preallocated so the harness's own bookkeeping stays out of peak RSS
+    latencies = np.empty(n)
+    sizes = np.empty(n, dtype=np.int64)
+    count = 0
+    last = start
+    for size, at in units:
+        latencies[count] = (at - last) / size
+        sizes[count] = size
+        count += 1
+        last = at
+    seconds = last - start
+
+    from simulators.engine import resolve_engine
+    record = {
+        'track': track,
+        'engine': engine,
+        'engine_used': resolve_engine(engine),
+        'n': n,
+        'workers': workers if engine == "parallel" else 1,
+        'seconds': seconds,
+        'sims_per_sec': n / seconds if seconds > 0 else float("inf"),
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF),
+        'peak_child_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN) if engine == "parallel" else None,
+    }
+
+    # Per-race latency; a batch or chunk counts once for every race in it
+    lat = np.repeat(latencies[:count], sizes[:count])
+    for q in (50, 90, 99):
+        record[f'latency_p{q}_us'] = float(np.percentile(lat, q)) * 1e6
+
+    record['traced_peak_mb'] = None
+    record['traced_sims'] = None
+    if allocations and engine != "parallel":
+        traced = min(n, ALLOC_SIMS)
+        tracemalloc.start()
+        for _ in _race_units(track, engine, traced, workers):
+            pass
+        record['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        record['traced_sims'] = traced
+        tracemalloc.stop()
+
+    return record
+
+
+def _run_isolated(track: str, engine: str, n: int, workers: int, allocations: bool) -> Dict:
+    """run_case in a fresh interpreter so peak RSS belongs to this case alone"""
+    cmd = [sys.executable, "-m", "simulators.benchmark", "--case", f"{track}:{engine}:{n}",
+           "--workers", str(workers)]
+    if not allocations:
+        cmd.append("--no-allocations")
+    proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def machine_info() -> Dict:
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_benchmarks(tracks=tuple(ENGINES), engines: Optional[List[str]] = None,
+                   sizes=DEFAULT_SIZES, workers: Optional[int] = None,
+                   allocations: bool = True, verbose: bool = True) -> Dict:
+    """Every (track, engine, size) case, each in its own process"""
+    workers = workers or max(2, os.cpu_count() or 1)
+    results = []
+    for track in tracks:
+        for engine in ENGINES[track]:
+            if engines and engine not in engines:
+                continue
+            for n in sizes:
+                record = _run_isolated(track, engine, n, workers, allocations)
+                results.append(record)
+                if verbose:
+                    print(format_record(record), flush=True)
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'machine': machine_info(),
+        'results': results,
+    }
+
+
+def format_record(r: Dict) -> str:
+    traced = f"{r['traced_peak_mb']:>8.1f}" if r['traced_peak_mb'] is not None else f"{'-':>8}"
+    return (f"{r['track']:<8} {r['engine']:<10} {r['n']:>9,} {r['sims_per_sec']:>12,.0f}/s "
+            f"p50 {r['latency_p50_us']:>9.2f}us p99 {r['latency_p99_us']:>9.2f}us "
+            f"rss {r['peak_rss_mb']:>7.1f}MB traced {traced}MB")
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.10) -> List[str]:
+    """Regressions of current vs baseline, one message per failing metric
+
+    A case regresses if its throughput fell, or its peak RSS grew, by more
+    than threshold (a fraction). Cases missing from either side are skipped.
+    """
+    key = lambda r: (r['track'], r['engine'], r['n'])
+    base = {key(r): r for r in baseline['results']}
+    problems = []
+    for r in current['results']:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        name = f"{r['track']}/{r['engine']}/{r['n']:,}"
+        if r['sims_per_sec'] < b['sims_per_sec'] * (1 - threshold):
+            problems.append(f"{name}: {r['sims_per_sec']:,.0f} sims/s vs baseline {b['sims_per_sec']:,.0f}")
+        if r['peak_rss_mb'] > b['peak_rss_mb'] * (1 + threshold):
+            problems.append(f"{name}: peak RSS {r['peak_rss_mb']:.1f}MB vs baseline {b['peak_rss_mb']:.1f}MB")
+    return problems
+
+
+def _write_json(data: Dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the NASCAR race simulators")
+    parser.add_argument("--tracks", default=",".join(ENGINES), help="comma-separated tracks")
+    parser.add_argument("--engines", default=None, help="comma-separated engines (default: all per track)")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated run sizes")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="workers for the parallel engine (default: CPU count, at least 2)")
+    parser.add_argument("--no-allocations", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown / memory growth before a case counts as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the baseline")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        track, engine, n = args.case.split(":")
+        record = run_case(track, engine, int(n), args.workers or 2, not args.no_allocations)
+        print(json.dumps(record))
+        return 0
+
+    data = run_benchmarks(
+        tracks=args.tracks.split(","),
+        engines=args.engines.split(",") if args.engines else None,
+        sizes=[int(s) for s in args.sizes.split(",")],
+        workers=args.workers,
+        allocations=not args.no_allocations,
+    )
+    _write_json(data, args.out)
+    print(f"\nResults written to {args.out}")
+    if args.save_baseline:
+        _write_json(data, args.baseline or DEFAULT_BASELINE)
+        print(f"Baseline written to {args.baseline or DEFAULT_BASELINE}")
+        return 0
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = compare(data, baseline, args.threshold)
+        if problems:
+            print(f"\n{len(problems)} regression(s) beyond {args.threshold:.0%}:")
+            for p in problems:
+                print(f"  {p}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
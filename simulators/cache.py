@@ -0,0 +1,192 @@
+"""
+On-disk cache of seeded runs
+
+A seeded run is a pure function of its model, roster, engine (and engine
+version), options, workers, seed and size, so its result can be kept and
+returned instead of re-simulated. ResultCache stores results - per-race
+frames, RaceAccumulators or plain arrays - as .npz files under
+cache_dir()/results, named by a sha256 of all of those plus the race count.
+A hit touches the file, and every write evicts the least recently used
+files past the cache's byte budget.
+
+run_cached() puts the cache in front of a run function. Asking for more
+races than a cached entry holds extends that entry: only the missing races
+are simulated, from the next unused children of the run's SeedSequence, and
+the merged result is stored as a new entry. An extended entry is a valid
+run of the seed's stream but not the same races as a one-shot run of that
+size; the entry records its segments.
+
+    run_atlanta_monte_carlo(10_000, engine="vectorized", seed=7, cache=True)
+    run_atlanta_monte_carlo(50_000, engine="vectorized", seed=7, cache=True)  # 40k simulated
+"""
+
+import glob
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from simulators.accumulator import RaceAccumulator
+from simulators.parallel import default_workers
+from simulators.storage import cache_dir, frame_arrays, frame_from_arrays
+
+# Bump when the entry layout changes
+CACHE_FORMAT = 2
+
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+_METADATA_KEY = "__metadata__"
+
+
+def extend_result(cached, extra):
+    """cached followed by extra: frames and arrays are concatenated, accumulators merged"""
+    if isinstance(cached, RaceAccumulator):
+        return cached.merge(extra)
+    if isinstance(cached, np.ndarray):
+        return np.concatenate([cached, extra])
+    import pandas as pd
+    return pd.concat([cached, extra], ignore_index=True)
+
+
+class ResultCache:
+    """Results on disk under a content key, least recently used evicted past max_bytes"""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = os.path.join(cache_dir(path), "results")
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(spec: Dict) -> str:
+        """Content key of a run spec (everything but the race count)"""
+        text = json.dumps({'format': CACHE_FORMAT, **spec}, sort_keys=True, default=repr)
+        return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+    def entry_path(self, key: str, n_simulations: int) -> str:
+        return os.path.join(self.path, f"{key}-{n_simulations}.npz")
+
+    def sizes(self, key: str) -> List[int]:
+        """Race counts cached under key, ascending"""
+        paths = glob.glob(os.path.join(self.path, f"{key}-*.npz"))
+        return sorted(int(os.path.basename(p)[len(key) + 1:-4]) for p in paths)
+
+    def get(self, key: str, n_simulations: int) -> Optional[Tuple[object, Dict]]:
+        """(result, metadata) of a cached run, or None"""
+        path = self.entry_path(key, n_simulations)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                metadata = json.loads(str(data[_METADATA_KEY]))
+                kind = metadata['kind']
+                if kind == 'frame':
+                    # Original dtypes, so a hit is the frame a fresh run returns
+                    result = frame_from_arrays(data, restore_dtypes=True)
+                elif kind == 'accumulator':
+                    result = RaceAccumulator.from_arrays(data)
+                else:
+                    result = np.array(data['values'])
+            os.utime(path)
+        except (OSError, KeyError, ValueError, TypeError):
+            return None  # Missing, or written by another layout - a miss
+        return result, metadata
+
+    def put(self, key: str, n_simulations: int, result, metadata: Dict) -> str:
+        """Store result (written atomically), then evict down to the budget"""
+        if isinstance(result, RaceAccumulator):
+            kind, arrays = 'accumulator', result.to_arrays()
+        elif isinstance(result, np.ndarray):
+            kind, arrays = 'array', {'values': result}
+        else:
+            kind, arrays = 'frame', frame_arrays(result)
+        metadata = {**metadata, 'kind': kind, 'n_simulations': n_simulations,
+                    'created_at': datetime.now(timezone.utc).isoformat(timespec="seconds")}
+
+        path = self.entry_path(key, n_simulations)
+        os.makedirs(self.path, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays, **{_METADATA_KEY: np.array(json.dumps(metadata))})
+        os.replace(tmp, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Delete least recently used entries until the cache fits max_bytes
+        (never the keep path); returns the bytes freed"""
+        entries = []
+        for path in glob.glob(os.path.join(self.path, "*.npz")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total - freed <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            freed += size
+        return freed
+
+    def total_bytes(self) -> int:
+        return sum(os.path.getsize(p) for p in glob.glob(os.path.join(self.path, "*.npz")))
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.path, "*.npz")):
+            os.remove(path)
+
+
+def as_result_cache(cache: Union[bool, ResultCache, None]) -> Optional[ResultCache]:
+    """cache=True means the default ResultCache; False/None no cache"""
+    if isinstance(cache, ResultCache):
+        return cache
+    return ResultCache() if cache else None
+
+
+def run_cached(cache: ResultCache, spec: Dict, n_simulations: int, seed: int,
+               workers: int, run: Callable[[int, np.random.SeedSequence], object],
+               combine: Callable[[object, object], object] = extend_result):
+    """run(n, seed_seq) for n_simulations races, through cache
+
+    run must spawn one child of seed_seq per worker (as run_parallel does),
+    so a run without cached races is exactly run(n_simulations,
+    SeedSequence(seed)). Otherwise the largest cached entry below
+    n_simulations is extended with run(missing, seed_seq) on the children
+    after the ones it used, combined by combine(cached, extra).
+    """
+    workers = max(1, workers or default_workers())
+    seed = int(seed)
+    key = cache.key({**spec, 'seed': seed, 'workers': workers})
+
+    hit = cache.get(key, n_simulations)
+    if hit is not None:
+        return hit[0]
+
+    smaller = [n for n in cache.sizes(key) if n < n_simulations]
+    base = cache.get(key, smaller[-1]) if smaller else None
+    if base is None:
+        result = run(n_simulations, np.random.SeedSequence(seed))
+        metadata = {'children': workers, 'segments': [n_simulations]}
+    else:
+        cached, cached_meta = base
+        done = cached_meta['n_simulations']
+        extra = run(n_simulations - done,
+                    np.random.SeedSequence(seed, n_children_spawned=cached_meta['children']))
+        result = combine(cached, extra)
+        metadata = {'children': cached_meta['children'] + workers,
+                    'segments': cached_meta['segments'] + [n_simulations - done]}
+
+    try:
+        cache.put(key, n_simulations, result, metadata)
+    except OSError:
+        pass  # Read-only or full cache directory - the run still counts
+    return result
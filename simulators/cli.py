@@ -0,0 +1,236 @@
+"""
+Command-line entry point for every track
+
+    python -m simulators run atlanta --n 1000000 --engine vectorized --workers 16 --seed 42 --out runs/atlanta.npz
+    python -m simulators run phoenix --n 1000000 --engine counts
+    python -m simulators tracks
+    python -m simulators serve --port 8765 --workers 4
+
+Startup stays light: only the track being run is imported, and pandas only
+when the run needs it - the Atlanta/COTA engines aggregate with it, a
+Phoenix run without --out never loads it. --instrument adds the startup to
+the report as a 'startup' phase (from entering the CLI to the first race),
+split into the track import (numpy, model and roster loading) and pandas,
+and its wall time counts from there too.
+
+--out takes a results archive (.npz, .parquet, .feather; needs a per-race,
+non-streaming run) or a .json file for the summary. --save writes the
+track's default results archive under $NASCAR_MC_RESULTS_DIR, as the track
+modules' __main__ blocks do.
+"""
+
+from time import perf_counter
+
+_START = perf_counter()  # Before any other import, so startup includes them
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+from simulators.tracks import TRACKS
+
+PHOENIX_ENGINES = ("scalar", "vectorized", "counts")
+
+TRACK_NAMES = tuple(TRACKS)
+
+
+def _startup(recorder, imported_at: float, pandas_seconds: float = 0.0):
+    """Book the time since _START as the 'startup' phase and its parts"""
+    if recorder is None:
+        return
+    now = perf_counter()
+    recorder.add("startup", now - _START)
+    recorder.add("startup.imports", imported_at - _START)
+    if pandas_seconds:
+        recorder.add("startup.pandas", pandas_seconds)
+
+
+def _import_pandas() -> float:
+    """Import pandas now and return the seconds it took (0 if already loaded)"""
+    if "pandas" in sys.modules:
+        return 0.0
+    start = perf_counter()
+    import pandas  # noqa: F401
+    return perf_counter() - start
+
+
+def _write_out(path: str, result, summary, metadata: Dict) -> str:
+    """--out: the summary as JSON, or the per-race frame as a results archive"""
+    if path.endswith(".json"):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({'metadata': metadata, 'summary': summary}, f, indent=2, default=str)
+        return path
+    from simulators.storage import save_results
+    return save_results(result, path, metadata)
+
+
+def _default_seed(args):
+    """A fresh root seed when none was given - printed so the run can be repeated"""
+    if args.seed is None:
+        import numpy as np
+        args.seed = np.random.SeedSequence().entropy
+        if not args.quiet:
+            print(f"Seed: {args.seed}")
+
+
+def _print_saved(path: str):
+    print(f"\n{'='*70}")
+    print(f"Results saved to: {path}")
+    print(f"{'='*70}\n")
+
+
+def _run_engine_track(args, parser, recorder) -> int:
+    from simulators.engine import ENGINES
+    args.engine = args.engine or "scalar"
+    if args.engine not in ENGINES:
+        parser.error(f"{args.track} engines: {', '.join(ENGINES)}")
+    # A track module runs as run_<track>_monte_carlo / analyze_<track>_results
+    module = importlib.import_module(TRACKS[args.track][0])
+    run_name, analyze_name = f"run_{args.track}_monte_carlo", f"analyze_{args.track}_results"
+    results_file = module.RESULTS_FILE
+    imported_at = perf_counter()
+    pandas_seconds = _import_pandas()
+    _startup(recorder, imported_at, pandas_seconds)
+
+    streaming = args.streaming or args.rao_blackwell or args.finishing_order
+    outputs = _outputs(args, results_file)
+    if streaming and any(not path.endswith(".json") for path in outputs):
+        parser.error("per-race results need a non-streaming run - use a .json --out for the summary")
+    _default_seed(args)
+
+    result = getattr(module, run_name)(
+        args.n, engine=args.engine, batch_size=args.batch_size, workers=args.workers,
+        seed=args.seed, streaming=args.streaming, target_half_width=args.target_half_width,
+        rao_blackwell=args.rao_blackwell, finishing_order=args.finishing_order,
+        instrument=recorder if recorder is not None else False, quiet=args.quiet, cache=args.cache,
+    )
+    summary = getattr(module, analyze_name)(result)
+
+    metadata = _metadata(args, module.MODEL_VERSION, summary.n_races)
+    for path in outputs:
+        _print_saved(_write_out(path, result, summary.to_dict(), metadata))
+    return 0
+
+
+def _run_phoenix(args, parser, recorder) -> int:
+    args.engine = args.engine or "vectorized"
+    if args.engine not in PHOENIX_ENGINES:
+        parser.error(f"phoenix engines: {', '.join(PHOENIX_ENGINES)}")
+    if args.streaming or args.rao_blackwell or args.finishing_order or args.target_half_width:
+        parser.error("phoenix runs take no streaming, Rao-Blackwell, finishing-order or precision options")
+    if args.engine == "counts" and any(not path.endswith(".json") for path in _outputs(args, None)):
+        parser.error("per-race results need --engine scalar or vectorized")
+    _default_seed(args)
+    phoenix = importlib.import_module(TRACKS["phoenix"][0])
+    _startup(recorder, perf_counter())
+
+    start = perf_counter()
+    winners = phoenix.simulate_winners(args.n, engine=args.engine, workers=args.workers,
+                                       seed=args.seed, cache=args.cache)
+    counts = phoenix.win_counts(winners, args.engine)
+    if recorder is not None:
+        recorder.add("run", perf_counter() - start)
+        recorder.races += args.n
+    phoenix.print_predictions(counts)
+    if recorder is not None:
+        recorder.print_report(perf_counter() - start)
+
+    outputs = _outputs(args, None)
+    if outputs:
+        names = [d.name for d in phoenix.PHOENIX_DRIVERS]
+        summary = {'wins': dict(zip(names, counts.tolist())),
+                   'probability': dict(zip(names, (counts / max(args.n, 1)).tolist()))}
+        metadata = _metadata(args, phoenix.PHOENIX_MODEL.version, args.n)
+        for path in outputs:
+            frame = None
+            if not path.endswith(".json"):
+                import pandas as pd
+                frame = pd.DataFrame({'winner': pd.Categorical.from_codes(winners, names)})
+            _print_saved(_write_out(path, frame, summary, metadata))
+    return 0
+
+
+# Every other track runs on simulators.engine
+RUNNERS = {"phoenix": _run_phoenix}
+
+
+def _outputs(args, results_file: Optional[str]) -> List[str]:
+    outputs = [args.out] if args.out else []
+    if args.save and results_file:
+        from simulators.storage import results_dir
+        outputs.append(os.path.join(results_dir(), results_file))
+    return outputs
+
+
+def _metadata(args, model_version: str, n_races: int) -> Dict:
+    from simulators.storage import run_metadata
+    return run_metadata(args.track, model_version, n_races, engine=args.engine, seed=args.seed,
+                        workers=args.workers)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m simulators",
+                                     description="NASCAR Monte Carlo race predictions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="simulate a track and print its predictions")
+    run.add_argument("track", choices=TRACK_NAMES)
+    run.add_argument("--n", type=int, default=10_000, help="races to simulate (default 10000)")
+    run.add_argument("--engine", default=None,
+                     help="scalar (default), events, vectorized or compiled; "
+                          "phoenix: vectorized (default), scalar or counts")
+    run.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per CPU)")
+    run.add_argument("--seed", type=int, default=None, help="root seed (default: fresh, printed)")
+    run.add_argument("--batch-size", type=int, default=50_000)
+    run.add_argument("--streaming", action="store_true", help="aggregate instead of keeping per-race rows")
+    run.add_argument("--rao-blackwell", action="store_true", help="Rao-Blackwellized win probabilities")
+    run.add_argument("--finishing-order", action="store_true", help="simulate full finishing orders")
+    run.add_argument("--target-half-width", type=float, default=None,
+                     help="run to precision: widest top-15 95%% CI half-width, e.g. 0.0025")
+    run.add_argument("--cache", action="store_true", help="use and fill the on-disk result cache")
+    run.add_argument("--out", default=None, help="results archive (.npz/.parquet/.feather) or summary .json")
+    run.add_argument("--save", action="store_true",
+                     help="also write the track's default results archive under $NASCAR_MC_RESULTS_DIR")
+    run.add_argument("--instrument", action="store_true", help="print phase timers, counters and startup time")
+    run.add_argument("--quiet", action="store_true", help="no banner or progress lines")
+
+    commands.add_parser("tracks", help="list the tracks")
+
+    serve = commands.add_parser("serve", help="run the local prediction service (see simulators.service)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    serve.add_argument("--workers", type=int, default=1, help="pool worker processes (0 = one per CPU)")
+    serve.add_argument("--seed", type=int, default=None, help="default root seed of a request (default: fresh)")
+    serve.add_argument("--chunk-size", type=int, default=10_000,
+                       help="races per pool task - one partial record each")
+    serve.add_argument("--cache", action="store_true", help="also keep aggregates in the on-disk result cache")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "tracks":
+        for name in TRACK_NAMES:
+            print(name)
+        return 0
+    if args.command == "serve":
+        from simulators.service import serve
+        serve(args.host, args.port, workers=args.workers, seed=args.seed, chunk_size=args.chunk_size,
+              cache=args.cache)
+        return 0
+
+    recorder = None
+    if args.instrument:
+        from simulators.instrument import Recorder
+        recorder = Recorder()
+    return RUNNERS.get(args.track, _run_engine_track)(args, parser, recorder)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Rosters and track models from data files
+
+A track's drivers live in a roster file - CSV (one column per driver
+dataclass field, '#' lines are comments, an optional notes column is
+ignored) or a JSON list of objects - and its TrackModel in a TOML or JSON
+file mirroring the track_model dataclasses (see data/models/). Both are
+versioned with the repository: the model file carries the model version, the
+roster file name the season.
+
+load_track_files() parses them into (model, drivers) and evaluates the
+model on the roster (win scores, scenario boosts, chaos weights), handing
+the vectors to simulators.engine, which uses them for any roster of exactly
+these drivers. With cache=True the result is also kept on disk as one .npz
+keyed by a hash of both files' contents and the engine version, so a later
+load of unchanged files skips the parsing and the evaluation. The track
+modules load uncached - importing one writes nothing.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from dataclasses import fields
+from typing import Dict, List, Optional, Sequence, Tuple, Type, get_type_hints
+
+import numpy as np
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+from simulators.engine import ENGINE_VERSION, CompiledModel, register_compiled
+from simulators.roster import Roster
+from simulators.storage import cache_dir
+from simulators.track_model import ChaosEvent, Factor, Multiplier, TrackModel, WinModel
+
+# Repository data directory holding models/ and rosters/
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Bump when the cache layout or the meaning of a file changes
+CACHE_FORMAT = 1
+
+# Roster columns that are not driver fields
+IGNORED_COLUMNS = ("notes",)
+
+
+def data_path(*parts: str) -> str:
+    return os.path.join(DATA_DIR, *parts)
+
+
+def _read_mapping(path: str) -> Dict:
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if path.endswith(".json"):
+        with open(path) as f:
+            return json.load(f)
+    raise ValueError(f"Unsupported model file: {path!r} (expected .toml or .json)")
+
+
+def _factor(spec: Dict) -> Factor:
+    return Factor(**spec)
+
+
+def _multiplier(spec: Dict) -> Multiplier:
+    return Multiplier(**{**spec, 'values': tuple(spec.get('values', ()))})
+
+
+def _chaos_event(spec: Dict) -> ChaosEvent:
+    laps = spec['laps']
+    prob = spec['prob']
+    return ChaosEvent(**{
+        **spec,
+        # laps = [first] runs to the scheduled distance
+        'laps': (laps[0], laps[1] if len(laps) > 1 else None),
+        'prob': tuple(prob) if isinstance(prob, list) else prob,
+        'size': tuple(spec.get('size', (0, 0))),
+        'weights': tuple(_factor(f) for f in spec.get('weights', ())),
+    })
+
+
+def model_from_dict(spec: Dict) -> TrackModel:
+    """TrackModel from a parsed model file - unknown keys are an error"""
+    win = spec['win']
+    return TrackModel(**{
+        **spec,
+        'win': WinModel(**{
+            **win,
+            'multipliers': tuple(_multiplier(m) for m in win.get('multipliers', ())),
+            'scenarios': {name: tuple(_factor(f) for f in factors)
+                          for name, factors in win.get('scenarios', {}).items()},
+        }),
+        'chaos': tuple(_chaos_event(e) for e in spec.get('chaos', ())),
+        'stage_breaks': tuple(spec.get('stage_breaks', ())),
+    })
+
+
+def read_model(path: str) -> TrackModel:
+    """TrackModel from a .toml or .json model file"""
+    return model_from_dict(_read_mapping(path))
+
+
+def _convert(value, kind):
+    if kind is bool:
+        return value if isinstance(value, bool) else str(value).strip().lower() in ("1", "true", "yes")
+    return kind(value)
+
+
+def _driver(driver_cls: Type, row: Dict):
+    # Resolved hints - field.type is a string in modules with postponed annotations
+    hints = get_type_hints(driver_cls)
+    types = {f.name: hints[f.name] for f in fields(driver_cls)}
+    unknown = set(row) - set(types) - set(IGNORED_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown {driver_cls.__name__} columns: {sorted(unknown)}")
+    return driver_cls(**{name: _convert(value, types[name])
+                         for name, value in row.items() if name in types and value != ""})
+
+
+def read_roster(path: str, driver_cls: Type) -> List:
+    """Driver dataclasses from a .csv or .json roster file"""
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(line for line in f if not line.lstrip().startswith("#")))
+    elif path.endswith(".json"):
+        with open(path) as f:
+            rows = json.load(f)
+    else:
+        raise ValueError(f"Unsupported roster file: {path!r} (expected .csv or .json)")
+    return [_driver(driver_cls, row) for row in rows]
+
+
+def content_hash(paths: Sequence[str], *extra: str) -> str:
+    """sha256 over the files' bytes, the extra strings, CACHE_FORMAT and
+    ENGINE_VERSION (the cached vectors are CompiledModel's output)"""
+    h = hashlib.sha256(f"nascar-mc config v{CACHE_FORMAT} engine v{ENGINE_VERSION}".encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    for s in extra:
+        h.update(s.encode())
+    return h.hexdigest()
+
+
+def _save_cache(path: str, spec: Dict, drivers: List, driver_cls: Type, compiled: CompiledModel):
+    """Two members: the parsed files as JSON and the per-driver vectors as one
+    matrix (win scores, then chaos weights, then scenario boosts)"""
+    meta = {
+        'spec': spec,
+        'drivers': [{f.name: getattr(d, f.name) for f in fields(driver_cls)} for d in drivers],
+        'n_chaos': len(compiled.chaos_weights),
+        'boosts': list(compiled.boosts),
+    }
+    vectors = np.vstack([compiled.win_scores, *compiled.chaos_weights, *compiled.boosts.values()])
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), vectors=vectors)
+    os.replace(tmp, path)
+
+
+def _load_cache(path: str, driver_cls: Type) -> Tuple[TrackModel, List, Dict]:
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        vectors = data['vectors']
+    n_chaos = meta['n_chaos']
+    compiled = {
+        'win_scores': vectors[0],
+        'chaos_weights': list(vectors[1:1 + n_chaos]),
+        'boosts': dict(zip(meta['boosts'], vectors[1 + n_chaos:])),
+    }
+    drivers = [driver_cls(**row) for row in meta['drivers']]
+    return model_from_dict(meta['spec']), drivers, compiled
+
+
+def load_track_files(model_path: str, roster_path: str, driver_cls: Type,
+                     cache: bool = False, cache_path: Optional[str] = None) -> Tuple[TrackModel, List]:
+    """(model, drivers) from a model file and a roster file
+
+    With cache=True the parsed files and the model's per-driver vectors are
+    kept in cache_dir(cache_path) under the files' content hash and reused
+    while neither file changes.
+    """
+    key = content_hash([model_path, roster_path], driver_cls.__module__, driver_cls.__qualname__)
+    name = os.path.splitext(os.path.basename(model_path))[0]
+    path = os.path.join(cache_dir(cache_path), f"{name}-{key[:16]}.npz")
+
+    if cache and os.path.exists(path):
+        try:
+            model, drivers, compiled = _load_cache(path, driver_cls)
+        except (OSError, KeyError, ValueError, TypeError):
+            pass  # Unreadable or stale layout - rebuild it below
+        else:
+            register_compiled(model, drivers, **compiled)
+            return model, drivers
+
+    spec = _read_mapping(model_path)
+    model = model_from_dict(spec)
+    drivers = read_roster(roster_path, driver_cls)
+    compiled = CompiledModel(Roster(drivers), model)
+    register_compiled(model, drivers, compiled.win_scores, compiled.boosts, compiled.chaos_weights)
+    if cache:
+        try:
+            _save_cache(path, spec, drivers, driver_cls, compiled)
+        except OSError:
+            pass  # Read-only or missing cache directory - run uncached
+    return model, drivers
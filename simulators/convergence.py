@@ -0,0 +1,96 @@
+"""
+Confidence intervals and run-to-precision stopping
+
+Win probabilities are binomial proportions, so each driver gets a Wilson
+score interval (a normal one for Rao-Blackwellized estimates, which are
+means of per-race probabilities). run_to_precision keeps adding rounds of races until every
+top-k driver's interval is narrower than the requested half-width.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from simulators.accumulator import RaceAccumulator
+from simulators.parallel import run_parallel
+from simulators.rng import root_seed_sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes, n, z: float = Z_95) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilson score interval (low, high) for successes out of n trials"""
+    successes = np.asarray(successes, dtype=float)
+    if n == 0:
+        return np.zeros_like(successes), np.ones_like(successes)
+    p = successes / n
+    denom = 1.0 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center - half, center + half
+
+
+def max_half_width(accumulator: RaceAccumulator, top_k: int = 15, z: float = Z_95) -> float:
+    """Widest Wilson half-width among the top_k drivers by wins
+
+    A rao_blackwell accumulator uses the normal interval of its
+    expected-win estimates instead.
+    """
+    if accumulator.rao_blackwell:
+        if accumulator.n_races < 2:
+            return 1.0
+        top = np.argsort(-accumulator.prob_sum, kind="stable")[:top_k]
+        return float(z * accumulator.win_probability_se().to_numpy()[top].max())
+    wins = np.sort(accumulator.wins)[::-1][:top_k]
+    low, high = wilson_interval(wins, accumulator.n_races, z)
+    return float(((high - low) / 2).max()) if wins.size else 1.0
+
+
+def run_to_precision(task: Callable, round_size: int, accumulator: RaceAccumulator,
+                     target_half_width: float, top_k: int = 15,
+                     max_simulations: int = 10_000_000, workers: int = 1,
+                     seed: Optional[int] = None, rng: Optional[np.random.Generator] = None,
+                     args: tuple = (), streaming: bool = False,
+                     on_round_done: Callable[[RaceAccumulator, float], None] = None,
+                     recorder=None):
+    """Run rounds of round_size races until the top_k win-probability 95% CIs
+    are all within +/- target_half_width (or max_simulations is reached)
+
+    task is a run_parallel chunk task returning a DataFrame, or a
+    RaceAccumulator when streaming. Round r draws from the r-th child of the
+    run's SeedSequence, so (seed, round_size, workers) stays reproducible.
+    Returns the filled accumulator when streaming, else the concatenated frame.
+    With a recorder, task returns (result, Recorder) pairs that are merged into it.
+    """
+    import pandas as pd
+    root = root_seed_sequence(seed, rng)
+    frames: List[pd.DataFrame] = []
+
+    while accumulator.n_races < max_simulations:
+        size = min(round_size, max_simulations - accumulator.n_races)
+        chunks = run_parallel(task, size, workers=workers, seed=root.spawn(1)[0], args=args)
+        if recorder is not None:
+            for _, chunk_recorder in chunks:
+                recorder.merge(chunk_recorder)
+            chunks = [chunk for chunk, _ in chunks]
+        for chunk in chunks:
+            if streaming:
+                accumulator.merge(chunk)
+            else:
+                accumulator.update(chunk)
+                frames.append(chunk)
+
+        half_width = max_half_width(accumulator, top_k)
+        if on_round_done:
+            on_round_done(accumulator, half_width)
+        if half_width <= target_half_width:
+            break
+
+    if streaming:
+        return accumulator
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
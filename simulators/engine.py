@@ -0,0 +1,906 @@
+"""
+Shared race engine for every TrackModel
+
+The three engines every track used to implement on its own, written once
+against the data in a TrackModel:
+
+- RaceSimulator   one race at a time on a Roster, lap by lap or jumping
+                  straight from incident to incident (the reference engine)
+- BatchSimulator  a batch of races as NumPy arrays - use it for 100k+ sims
+- KernelSimulator a batch of races through a compiled per-race kernel
+                  (simulators.kernel, needs Numba)
+- run_monte_carlo parallel chunks, streaming aggregates, run-to-precision
+
+A track module declares its model and drivers and calls into this one, so
+any speedup here applies to every track.
+"""
+
+from __future__ import annotations
+
+import warnings
+import weakref
+from bisect import bisect
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from simulators.accumulator import RaceAccumulator
+from simulators.cache import ResultCache, as_result_cache, run_cached
+from simulators.convergence import run_to_precision
+from simulators.instrument import CountingGenerator, Recorder, as_recorder
+from simulators.parallel import run_parallel
+from simulators.progress import ProgressCallback, ProgressTracker, chunk_winners
+from simulators.rng import RaceRNG, as_generator, as_race_rng
+from simulators.roster import Roster, as_roster
+from simulators.sampling import sample_distinct, sample_rows
+from simulators.track_model import TrackModel, evaluate_factors
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ENGINES = ("scalar", "events", "vectorized", "compiled")
+
+# Bump when a change alters the races a seed produces or CompiledModel's
+# vectors - keys the result cache and the config cache
+ENGINE_VERSION = 1
+
+# Stats every model tracks besides its chaos events
+STAT_COLUMNS = ("total_cautions", "attrition_rate", "running_at_finish")
+
+
+# Per-driver vectors of a model read from data files (simulators.config), with
+# the driver rows they were evaluated on
+_PRECOMPILED = weakref.WeakKeyDictionary()
+
+
+def _driver_rows(drivers: Sequence) -> List[tuple]:
+    return [tuple(vars(d).values()) for d in drivers]
+
+
+def register_compiled(model: TrackModel, drivers: Sequence, win_scores: np.ndarray,
+                      boosts: Dict[str, np.ndarray], chaos_weights: List[np.ndarray]):
+    """Precomputed per-driver vectors of model, used for any roster whose
+    drivers equal these (field for field, in order)"""
+    _PRECOMPILED[model] = (_driver_rows(drivers), win_scores, boosts, chaos_weights)
+
+
+class CompiledModel:
+    """A TrackModel evaluated on one roster - every per-driver vector the engines use
+
+    Nothing here changes during a race, so it is built once per
+    (roster, model) via Roster.derived and shared by every race. The
+    per-driver vectors come from register_compiled when the roster matches.
+    """
+
+    def __init__(self, roster: Roster, model: TrackModel):
+        precompiled = _PRECOMPILED.get(model)
+        if precompiled is not None and precompiled[0] == _driver_rows(roster.drivers):
+            _, self.win_scores, self.boosts, self.chaos_weights = precompiled
+        else:
+            win = model.win
+            score = np.zeros(len(roster))
+            for attribute, weight in win.weights.items():
+                score = score + getattr(roster, attribute) * weight
+            multiplier = np.ones(len(roster))
+            for rule in win.multipliers:
+                multiplier = multiplier * np.where(rule.mask(roster), rule.factor, 1.0)
+
+            self.win_scores = score * multiplier
+            self.boosts = {name: evaluate_factors(factors, roster) for name, factors in win.scenarios.items()}
+            self.chaos_weights = [evaluate_factors(e.weights, roster) for e in model.chaos]
+
+        self.conditions = model.conditions
+        self.windows = [e.window(model.total_laps) for e in model.chaos]
+        self.once = [e.once for e in model.chaos]
+        # Per-lap probability of a constant-rate event, None for a per-lap table
+        self.constant_probs = [float(e.prob) if e.constant else None for e in model.chaos]
+        self.lap_probs = [e.lap_probs(model.total_laps) for e in model.chaos]
+        # P(first hit by lap k) for once events with per-lap probabilities
+        self.first_hit_cdfs = [(1.0 - np.cumprod(1.0 - p)).tolist() for p in self.lap_probs]
+
+        # Scalar lap loop: (event index, probability) to roll on each lap
+        self.schedule = [[] for _ in range(model.total_laps + 1)]
+        for i, ((first, last), probs) in enumerate(zip(self.windows, self.lap_probs)):
+            for lap, p in zip(range(first, last + 1), probs.tolist()):
+                self.schedule[lap].append((i, p))
+
+
+def compile_model(model: TrackModel, roster: Roster) -> CompiledModel:
+    return roster.derived(CompiledModel, model)
+
+
+def _first_hit(rng: RaceRNG, p: float) -> Optional[int]:
+    """Laps up to and including the first hit of a constant per-lap probability"""
+    if p <= 0.0:
+        return None
+    if p >= 1.0:
+        return 1
+    return rng.geometric(p)
+
+
+class RaceSimulator:
+    """One race of any TrackModel, state kept in the roster's arrays
+
+    Pass one Roster (and RaceRNG) to reuse them race after race, and a
+    simulators.instrument.Recorder to time the race phases.
+    """
+
+    def __init__(self, model: TrackModel, drivers: Union[Sequence, Roster],
+                 rng: np.random.Generator = None, recorder: Optional[Recorder] = None):
+        self.model = model
+        self.recorder = as_recorder(recorder)
+        self.rng = as_race_rng(rng)
+        self.roster = as_roster(drivers).reset()
+        self.drivers = self.roster.drivers
+        self.compiled = compile_model(model, self.roster)
+        self.total_laps = model.total_laps
+        self.current_lap = 0
+        self.caution_laps = []
+        self.flags = dict.fromkeys(self.compiled.conditions, False)
+        self.event_laps = {}
+
+    def fire(self, i: int, lap: int):
+        """Chaos event i happens on lap: collect its cars and throw the caution"""
+        event = self.model.chaos[i]
+        if event.collects:
+            roster = self.roster
+            field = roster.running_indices()
+            if not len(field):
+                return
+
+            size = self.rng.randint(*event.size)
+            if len(field) < size:
+                size = max(len(field) - event.spare, 0)
+            weights = self.compiled.chaos_weights[i][field]
+            victims = self.rng.sample(field.tolist(), weights.tolist(), size)
+
+            if event.terminal >= 1.0:
+                roster.running[victims] = False
+                roster.retired_lap[victims] = lap
+            else:
+                for victim in victims:
+                    if self.rng.random() < event.terminal:
+                        roster.running[victim] = False
+                        roster.retired_lap[victim] = lap
+                    else:
+                        roster.incidents[victim] += 1  # Damaged but running
+
+        if event.flag:
+            self.flags[event.name] = True
+            self.event_laps[event.name] = lap
+        self.caution_laps.append(lap)
+        if self.recorder.enabled:
+            self.recorder.count(f"events.{event.name}")
+
+    def _run_race_laps(self):
+        """Lap-by-lap chaos loop: roll every event whose window covers the lap"""
+        schedule = self.compiled.schedule
+        once = self.compiled.once
+        spent = [False] * len(once)
+        stage_breaks = self.model.stage_breaks
+
+        for lap in range(1, self.total_laps + 1):
+            self.current_lap = lap
+            for i, p in schedule[lap]:
+                if not spent[i] and self.rng.random() < p:
+                    spent[i] = once[i]
+                    self.fire(i, lap)
+
+            # Stage breaks (no incidents)
+            if lap in stage_breaks:
+                self.caution_laps.append(lap)
+
+    def _run_race_events(self):
+        """Discrete-event chaos: sample the lap of each incident directly
+
+        Once events take one draw against their first-hit distribution (a
+        geometric one for a constant probability), repeating events arrive
+        with geometric gaps. The incidents then happen in lap order, events
+        on the same lap in declaration order - as in the lap loop.
+        """
+        compiled = self.compiled
+        occurrences = []
+        for i, (first, last) in enumerate(compiled.windows):
+            p = compiled.constant_probs[i]
+            if compiled.once[i]:
+                if p is not None:
+                    hit = _first_hit(self.rng, p)
+                    lap = None if hit is None else first - 1 + hit
+                else:
+                    k = bisect(compiled.first_hit_cdfs[i], self.rng.random())
+                    lap = first + k if k < len(compiled.first_hit_cdfs[i]) else None
+                if lap is not None and lap <= last:
+                    occurrences.append((lap, i))
+            elif p is not None:
+                gap = _first_hit(self.rng, p)
+                lap = None if gap is None else first - 1 + gap
+                while lap is not None and lap <= last:
+                    occurrences.append((lap, i))
+                    lap += _first_hit(self.rng, p)
+            else:
+                for lap, p in enumerate(compiled.lap_probs[i].tolist(), start=first):
+                    if self.rng.random() < p:
+                        occurrences.append((lap, i))
+
+        occurrences.sort()
+        for lap, i in occurrences:
+            self.current_lap = lap
+            self.fire(i, lap)
+
+        self.caution_laps.extend(self.model.stage_breaks)
+        self.caution_laps.sort()
+        self.current_lap = self.total_laps
+
+    def _scores(self) -> np.ndarray:
+        """Win scores of the field as it stands - zero for cars out of the race"""
+        roster = self.roster
+        # Only the running mask, scenarios and damage vary race to race
+        win = self.model.win
+        scores = self.compiled.win_scores
+        for name, boost in self.compiled.boosts.items():
+            if self.flags[name]:
+                scores = scores * boost
+        if win.damage:
+            scores = scores * (1.0 - roster.incidents * win.damage)
+        if win.floor is not None:
+            scores = np.maximum(win.floor, scores)
+        return scores * roster.running
+
+    def winner_index(self) -> int:
+        """Roster index of the winner, drawn over the running field"""
+        running = self.roster.running
+        if not running.any():
+            return int(self.rng.random() * len(running))
+        return self.rng.choices(range(len(running)), self._scores().tolist())[0]
+
+    def win_probabilities(self) -> np.ndarray:
+        """Exact win probability per driver given the field as it stands"""
+        if not self.roster.running.any():
+            return np.full(len(self.roster), 1.0 / len(self.roster))
+        scores = self._scores()
+        return scores / scores.sum()
+
+    def determine_winner(self):
+        return self.drivers[self.winner_index()]
+
+    def finishing_order(self, winner: int) -> np.ndarray:
+        """Roster indices in finishing order, winner first
+
+        Running cars follow by Plackett-Luce on their win scores, then the
+        retired ones, the latest retirement first and cars from the same
+        incident in random order.
+        """
+        roster = self.roster
+        u = np.array([self.rng.random() for _ in range(len(roster))])
+        with np.errstate(divide="ignore"):
+            key = np.where(roster.running, np.log(self._scores()) - np.log(-np.log(u)),
+                           roster.retired_lap + u)
+        key[winner] = np.inf
+        return finish_order(key, roster.running)
+
+    def simulate_race(self, event_skipping: bool = False, win_probs: bool = False,
+                      finishing_order: bool = False) -> Dict:
+        """Run one race, returning its result row
+
+        event_skipping=True jumps straight to each incident lap instead of
+        rolling every lap; the race distribution is the same. win_probs=True
+        adds 'win_probs', every driver's win probability given how the race
+        left the field; finishing_order=True adds 'finishing_order', roster
+        indices from first to last.
+        """
+        recorder = self.recorder
+        with recorder.phase("chaos"):
+            if event_skipping:
+                self._run_race_events()
+            else:
+                self._run_race_laps()
+
+        roster = self.roster
+        with recorder.phase("winner"):
+            winner = self.winner_index()
+        running_at_finish = roster.n_running()
+
+        result = {
+            'winner': roster.names[winner],
+            'manufacturer': roster.manufacturers[winner],
+            'team': roster.teams[winner],
+            'tier': roster.tiers[winner],
+        }
+        for event in self.model.chaos:
+            if event.flag:
+                result[event.name] = self.flags[event.name]
+            if event.record_lap:
+                result[f"{event.name}_lap"] = self.event_laps.get(event.name)
+        result['total_cautions'] = len(self.caution_laps)
+        result['running_at_finish'] = running_at_finish
+        result['attrition_rate'] = (len(roster) - running_at_finish) / len(roster)
+        if win_probs:
+            result['win_probs'] = self.win_probabilities()
+        if finishing_order:
+            with recorder.phase("finishing_order"):
+                result['finishing_order'] = self.finishing_order(winner)
+        return result
+
+
+def _phases(model: TrackModel) -> List[List[int]]:
+    """Car-collecting chaos events grouped into runs of overlapping lap windows
+
+    Phases are disjoint in laps, so applying them one after another keeps
+    the lap order of every incident that can change the field.
+    """
+    collecting = sorted((e.window(model.total_laps), i) for i, e in enumerate(model.chaos) if e.collects)
+    phases, end = [], 0
+    for (first, last), i in collecting:
+        if phases and first <= end:
+            phases[-1].append(i)
+            end = max(end, last)
+        else:
+            phases.append([i])
+            end = last
+    return [sorted(phase) for phase in phases]
+
+
+class BatchSimulator:
+    """Vectorized engine - simulates a batch of races of any TrackModel as NumPy arrays
+
+    Same race rules as RaceSimulator, but the field is a (n_sims x n_drivers)
+    boolean `running` matrix and each chaos event is drawn for the whole
+    batch at once. A repeating event draws a per-race count up front and is
+    applied in rounds (round r handles the r-th incident of every race that
+    has one), so the work scales with the incidents rather than the laps.
+    Only events with overlapping windows are stepped lap by lap, to keep
+    their incidents in order.
+
+    With an enabled Recorder the phases are timed and the Generator is
+    wrapped to count its calls; otherwise nothing extra runs.
+    """
+
+    def __init__(self, model: TrackModel, drivers: Union[Sequence, Roster],
+                 rng: np.random.Generator = None, recorder: Optional[Recorder] = None):
+        roster = as_roster(drivers)
+        self.model = model
+        self.roster = roster
+        self.drivers = roster.drivers
+        self.recorder = as_recorder(recorder)
+        self.rng = as_generator(rng)
+        if self.recorder.enabled:
+            self.rng = CountingGenerator(self.rng, self.recorder)
+        self.total_laps = model.total_laps
+        self.n_drivers = len(roster)
+
+        self.names = roster.names
+        self.manufacturers = roster.manufacturers
+        self.teams = roster.teams
+        self.tiers = roster.tiers
+
+        self.compiled = compile_model(model, roster)
+        self.phases = _phases(model)
+        self._phase_names = ["chaos." + "+".join(model.chaos[i].name for i in phase) for phase in self.phases]
+        self.cautions_only = [i for i, e in enumerate(model.chaos) if not e.collects]
+        self.tracks_damage = any(e.collects and e.terminal < 1.0 for e in model.chaos)
+
+    def _first_hits(self, i: int, n: int):
+        """(hit, lap) per race for once event i - lap is only meaningful where hit"""
+        event = self.model.chaos[i]
+        first, last = self.compiled.windows[i]
+        if event.constant:
+            if event.prob <= 0.0:
+                return np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int64)
+            lap = first - 1 + self.rng.geometric(min(float(event.prob), 1.0), size=n)
+            return lap <= last, lap
+        hits = self.rng.random((n, last - first + 1)) < self.compiled.lap_probs[i]
+        return hits.any(axis=1), first + hits.argmax(axis=1)
+
+    def _counts(self, i: int, n: int) -> np.ndarray:
+        """Incidents per race for repeating event i"""
+        event = self.model.chaos[i]
+        first, last = self.compiled.windows[i]
+        if event.constant:
+            return self.rng.binomial(last - first + 1, float(event.prob), size=n)
+        return (self.rng.random((n, last - first + 1)) < self.compiled.lap_probs[i]).sum(axis=1)
+
+    def _collect(self, i: int, rows: np.ndarray, field: np.ndarray,
+                 running: np.ndarray, incidents: Optional[np.ndarray]):
+        """Event i in races rows (whose running fields are field): victims without replacement
+
+        Calls come in race order, so each one is the next incident number
+        for the retirements it records.
+        """
+        event = self.model.chaos[i]
+        self._incident += 1
+        if self.recorder.enabled:
+            self.recorder.count(f"events.{event.name}", rows.size)
+        low, high = event.size
+        size = self.rng.integers(low, high + 1, size=rows.size)
+        if event.spare:
+            n_running = field.sum(axis=1)
+            size = np.where(n_running < size, np.maximum(n_running - event.spare, 0), size)
+
+        picks, hit = sample_distinct(self.compiled.chaos_weights[i], field, size, self.rng)
+        victim_rows = np.broadcast_to(rows[:, None], picks.shape)[hit]
+        victims = picks[hit]
+        if event.terminal >= 1.0:
+            running[victim_rows, victims] = False
+            if self._retired is not None:
+                self._retired[victim_rows, victims] = self._incident
+            return
+        # Terminal-damage roll for each picked car: out of the race or damaged
+        terminal = self.rng.random(victims.size) < event.terminal
+        running[victim_rows[terminal], victims[terminal]] = False
+        if self._retired is not None:
+            self._retired[victim_rows[terminal], victims[terminal]] = self._incident
+        # Victims are distinct within an incident, so a plain += cannot drop a hit
+        incidents[victim_rows[~terminal], victims[~terminal]] += 1
+
+    def _with_field(self, rows: np.ndarray, running: np.ndarray):
+        """rows narrowed to races with someone left to collect, and their fields"""
+        field = running[rows]
+        has_field = field.any(axis=1)
+        return rows[has_field], field[has_field]
+
+    def _run_once(self, i: int, running, incidents, cautions, out: Dict):
+        n = running.shape[0]
+        fired, lap = self._first_hits(i, n)
+        rows, field = self._with_field(np.flatnonzero(fired), running)
+        if rows.size:
+            self._collect(i, rows, field, running, incidents)
+        happened = np.zeros(n, dtype=bool)
+        happened[rows] = True
+        cautions += happened
+        self._record(i, happened, lap, out)
+
+    def _run_rounds(self, i: int, running, incidents, cautions, out: Dict):
+        n_incidents = self._counts(i, running.shape[0])
+        happened = np.zeros(running.shape[0], dtype=bool)
+
+        for r in range(n_incidents.max(initial=0)):
+            rows, field = self._with_field(np.flatnonzero(n_incidents > r), running)
+            if rows.size == 0:
+                continue
+            self._collect(i, rows, field, running, incidents)
+            cautions[rows] += 1
+            happened[rows] = True
+        self._record(i, happened, None, out)
+
+    def _run_laps(self, phase: List[int], running, incidents, cautions, out: Dict):
+        """Overlapping events, stepped lap by lap in declaration order"""
+        n = running.shape[0]
+        chaos = self.model.chaos
+        windows = self.compiled.windows
+        spent = {i: np.zeros(n, dtype=bool) for i in phase if chaos[i].once}
+        happened = {i: np.zeros(n, dtype=bool) for i in phase}
+        laps = {i: np.zeros(n, dtype=np.int64) for i in phase}
+
+        start = min(windows[i][0] for i in phase)
+        end = max(windows[i][1] for i in phase)
+        for lap in range(start, end + 1):
+            for i in phase:
+                first, last = windows[i]
+                if not first <= lap <= last:
+                    continue
+                hit = self.rng.random(n) < self.compiled.lap_probs[i][lap - first]
+                if i in spent:
+                    hit &= ~spent[i]
+                    spent[i] |= hit
+                rows, field = self._with_field(np.flatnonzero(hit), running)
+                if rows.size == 0:
+                    continue
+                self._collect(i, rows, field, running, incidents)
+                cautions[rows] += 1
+                laps[i][rows[~happened[i][rows]]] = lap
+                happened[i][rows] = True
+        for i in phase:
+            self._record(i, happened[i], laps[i], out)
+
+    def _run_cautions(self, i: int, cautions, out: Dict):
+        """An event that collects nobody - only its cautions and flag"""
+        n = cautions.shape[0]
+        if self.model.chaos[i].once:
+            happened, lap = self._first_hits(i, n)
+            counts = happened
+        else:
+            counts = self._counts(i, n)
+            happened, lap = counts > 0, None
+        cautions += counts
+        if self.recorder.enabled:
+            self.recorder.count(f"events.{self.model.chaos[i].name}", int(counts.sum()))
+        self._record(i, happened, lap, out)
+
+    def _record(self, i: int, happened: np.ndarray, lap: Optional[np.ndarray], out: Dict):
+        event = self.model.chaos[i]
+        if event.flag:
+            out[event.name] = happened
+        if event.record_lap:
+            out[f"{event.name}_lap"] = np.where(happened, lap, np.nan)
+
+    def win_scores(self, running: np.ndarray, incidents: Optional[np.ndarray],
+                   flags: Dict[str, np.ndarray]) -> np.ndarray:
+        """(n x drivers) winner-draw weights - zero for cars out, uniform if nobody runs"""
+        win = self.model.win
+        compiled = self.compiled
+        if compiled.boosts or win.damage or win.floor is not None:
+            scores = np.empty(running.shape)
+            scores[:] = compiled.win_scores
+            for name, boost in compiled.boosts.items():
+                scores[flags[name]] *= boost
+            if win.damage and incidents is not None:
+                scores *= 1.0 - incidents * win.damage
+            if win.floor is not None:
+                np.maximum(win.floor, scores, out=scores)
+            scores *= running
+        else:
+            scores = compiled.win_scores * running
+        # Nobody running - scalar engine picks uniformly from the whole field
+        scores[~running.any(axis=1)] = 1.0
+        return scores
+
+    def determine_winner(self, running: np.ndarray, incidents: Optional[np.ndarray],
+                         flags: Dict[str, np.ndarray], u: Optional[np.ndarray] = None) -> np.ndarray:
+        """Masked categorical winner draw for every race in the batch
+
+        u is one uniform per race (shape (n, 1)) to draw with instead of
+        fresh ones - pass the same u to compare models on the same races.
+        """
+        return self.draw_winners(self.win_scores(running, incidents, flags), u)
+
+    def draw_winners(self, scores: np.ndarray, u: Optional[np.ndarray] = None) -> np.ndarray:
+        if u is None:
+            u = self.rng.random((scores.shape[0], 1))
+        return sample_rows(scores, u)[:, 0]
+
+    def finishing_order(self, scores: np.ndarray, winner: np.ndarray, running: np.ndarray,
+                        retired: np.ndarray) -> np.ndarray:
+        """(n x drivers) roster indices in finishing order, winner first
+
+        The rest of the running field follows by Plackett-Luce on scores -
+        a Gumbel-perturbed argsort - then the retired cars, the latest
+        retirement first and cars from the same incident in random order.
+        """
+        u = self.rng.random(scores.shape)
+        with np.errstate(divide="ignore"):
+            key = np.where(running, np.log(scores) - np.log(-np.log(u)), retired + u)
+        key[np.arange(key.shape[0]), winner] = np.inf
+        return finish_order(key, running)
+
+    def simulate_field(self, n_sims: int, retired: Optional[np.ndarray] = None):
+        """Chaos phase of a batch of races: (running, incidents, cautions, chaos)
+
+        chaos holds the flag and lap columns; incidents is None unless some
+        event can damage a car without retiring it. retired, an (n_sims x
+        drivers) array of zeros, gets the number of the incident that took
+        each car out - later incidents have higher numbers.
+        """
+        self._retired = retired
+        self._incident = 0
+        running = np.ones((n_sims, self.n_drivers), dtype=bool)
+        incidents = np.zeros((n_sims, self.n_drivers), dtype=np.int64) if self.tracks_damage else None
+        cautions = np.full(n_sims, len(self.model.stage_breaks), dtype=np.int64)
+        chaos = {}
+        recorder = self.recorder
+
+        with recorder.phase("chaos"):
+            for phase, name in zip(self.phases, self._phase_names):
+                with recorder.phase(name):
+                    if len(phase) > 1:
+                        self._run_laps(phase, running, incidents, cautions, chaos)
+                    elif self.model.chaos[phase[0]].once:
+                        self._run_once(phase[0], running, incidents, cautions, chaos)
+                    else:
+                        self._run_rounds(phase[0], running, incidents, cautions, chaos)
+            for i in self.cautions_only:
+                with recorder.phase(f"chaos.{self.model.chaos[i].name}"):
+                    self._run_cautions(i, cautions, chaos)
+        return running, incidents, cautions, chaos
+
+    def simulate_races(self, n_sims: int, win_probs: bool = False,
+                       finishing_order: bool = False) -> Dict[str, np.ndarray]:
+        """Run a batch of races, returning one array per simulate_race column
+
+        win_probs=True adds 'win_probs', an (n_sims x drivers) matrix of
+        each race's exact win probabilities over its surviving field;
+        finishing_order=True adds 'finishing_order', each race's roster
+        indices from first to last.
+        """
+        retired = np.zeros((n_sims, self.n_drivers), dtype=np.int32) if finishing_order else None
+        running, incidents, cautions, chaos = self.simulate_field(n_sims, retired)
+        recorder = self.recorder
+        with recorder.phase("winner"):
+            scores = self.win_scores(running, incidents, chaos)
+            winner = self.draw_winners(scores)
+        running_at_finish = running.sum(axis=1)
+
+        with recorder.phase("results"):
+            result = batch_results(self.model, self.roster, winner, chaos, cautions, running_at_finish)
+            if win_probs:
+                result['win_probs'] = scores / scores.sum(axis=1, keepdims=True)
+        if finishing_order:
+            with recorder.phase("finishing_order"):
+                result['finishing_order'] = self.finishing_order(scores, winner, running, retired)
+        return result
+
+
+def finish_order(key: np.ndarray, running: np.ndarray) -> np.ndarray:
+    """Per row: running drivers by descending key, then the rest by descending key"""
+    return np.lexsort((-key, ~running), axis=-1)
+
+
+def batch_results(model: TrackModel, roster: Roster, winner: np.ndarray, chaos: Dict[str, np.ndarray],
+                  cautions: np.ndarray, running_at_finish: np.ndarray) -> Dict[str, np.ndarray]:
+    """A batch engine's arrays as simulate_race columns, one array each
+
+    chaos holds the flag (and '<name>_lap') column of every flagged event.
+    """
+    result = {
+        'winner': roster.names[winner],
+        'manufacturer': roster.manufacturers[winner],
+        'team': roster.teams[winner],
+        'tier': roster.tiers[winner],
+    }
+    for event in model.chaos:
+        if event.flag:
+            result[event.name] = chaos[event.name]
+        if event.record_lap:
+            result[f"{event.name}_lap"] = chaos[f"{event.name}_lap"]
+    result['total_cautions'] = cautions
+    result['running_at_finish'] = running_at_finish
+    result['attrition_rate'] = (len(roster) - running_at_finish) / len(roster)
+    return result
+
+
+def batch_simulator(model: TrackModel, drivers: Union[Sequence, Roster],
+                    rng: np.random.Generator = None, engine: str = "vectorized",
+                    recorder: Optional[Recorder] = None):
+    """Simulator with simulate_races(n) for a batch engine
+
+    engine="compiled" falls back to BatchSimulator (with a warning) when
+    Numba is not installed.
+    """
+    if engine == "compiled":
+        from simulators import kernel
+        if kernel.HAVE_NUMBA:
+            return kernel.KernelSimulator(model, drivers, rng, recorder=recorder)
+        warnings.warn("engine='compiled' needs numba - using the vectorized engine",
+                      RuntimeWarning, stacklevel=2)
+    return BatchSimulator(model, drivers, rng, recorder)
+
+
+def resolve_engine(engine: str) -> str:
+    """The engine a run really uses - compiled without Numba runs vectorized"""
+    if engine == "compiled":
+        from simulators import kernel
+        if not kernel.HAVE_NUMBA:
+            return "vectorized"
+    return engine
+
+
+def new_accumulator(model: TrackModel, drivers: Sequence, rao_blackwell: bool = False,
+                    finishing_order: bool = False) -> RaceAccumulator:
+    """Streaming aggregates for a model: its flagged events and the standard stats"""
+    return RaceAccumulator(drivers, conditions=list(model.conditions),
+                           stats=list(STAT_COLUMNS + model.lap_columns), rao_blackwell=rao_blackwell,
+                           finishing_order=finishing_order)
+
+
+def simulate_chunk(n_simulations: int, seed_seq: np.random.SeedSequence, model: TrackModel,
+                   drivers: Sequence, engine: str = "vectorized", batch_size: int = 50000,
+                   on_batch: Optional[Callable[[int, Iterable], None]] = None,
+                   streaming: bool = False, rao_blackwell: bool = False,
+                   finishing_order: bool = False, instrument: bool = False):
+    """Simulate one chunk of races on a single worker
+
+    on_batch(races, winners) is called as races finish (e.g. a
+    ProgressTracker's update) - only usable in-process. With streaming=True each batch of results is folded into a
+    RaceAccumulator and dropped instead of kept as rows. rao_blackwell=True
+    and finishing_order=True (streaming only) also fold in every race's win
+    probabilities and finishing order.
+
+    instrument=True times and counts the chunk with a Recorder and returns
+    (result, recorder) - recorders can cross process boundaries.
+    """
+    recorder = Recorder() if instrument else None
+    result = _simulate_chunk(n_simulations, seed_seq, model, drivers, engine, batch_size, on_batch,
+                             streaming, rao_blackwell, finishing_order, as_recorder(recorder))
+    if recorder is None:
+        return result
+    recorder.races += n_simulations
+    return result, recorder
+
+
+def _simulate_chunk(n_simulations, seed_seq, model, drivers, engine, batch_size, on_batch,
+                    streaming, rao_blackwell, finishing_order,
+                    recorder) -> Union[pd.DataFrame, RaceAccumulator]:
+    import pandas as pd
+    accumulator = new_accumulator(model, drivers, rao_blackwell, finishing_order) if streaming else None
+    rng = np.random.default_rng(seed_seq)
+
+    if engine in ("vectorized", "compiled"):
+        with recorder.phase("setup"):
+            sim = batch_simulator(model, drivers, rng, engine, recorder)
+        batches = []
+        done = 0
+        while done < n_simulations:
+            size = min(batch_size, n_simulations - done)
+            batch = sim.simulate_races(size, win_probs=rao_blackwell, finishing_order=finishing_order)
+            if streaming:
+                with recorder.phase("accumulate"):
+                    accumulator.update(batch)
+            else:
+                with recorder.phase("frame"):
+                    batches.append(pd.DataFrame(batch))
+            done += size
+            if on_batch:
+                on_batch(size, batch['winner'])
+
+        if streaming:
+            return accumulator
+        with recorder.phase("frame"):
+            return pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
+
+    race_rng = RaceRNG(rng)
+    roster = Roster(drivers)
+    results = []
+
+    for i in range(n_simulations):
+        with recorder.phase("setup"):
+            sim = RaceSimulator(model, roster, race_rng, recorder)
+        result = sim.simulate_race(event_skipping=(engine == "events"), win_probs=rao_blackwell,
+                                   finishing_order=finishing_order)
+        results.append(result)
+
+        if streaming and len(results) == batch_size:
+            with recorder.phase("accumulate"):
+                accumulator.update(pd.DataFrame(results))
+            results = []
+
+        if on_batch:
+            on_batch(1, (result['winner'],))
+
+    if recorder.enabled:
+        recorder.count("rng.variates", race_rng.uniforms_used())
+    with recorder.phase("frame"):
+        df = pd.DataFrame(results)
+    if streaming:
+        with recorder.phase("accumulate"):
+            return accumulator.update(df) if results else accumulator
+    return df
+
+
+def cache_spec(model: TrackModel, drivers: Sequence, engine: str, batch_size: int, streaming: bool,
+               rao_blackwell: bool, finishing_order: bool) -> Dict:
+    """What a cached run's key covers besides its seed, workers and size"""
+    return {
+        'model': repr(model), 'drivers': [repr(d) for d in as_roster(drivers).drivers],
+        'engine': resolve_engine(engine), 'engine_version': ENGINE_VERSION,
+        'batch_size': batch_size, 'streaming': streaming,
+        'rao_blackwell': rao_blackwell, 'finishing_order': finishing_order,
+    }
+
+
+def run_monte_carlo(model: TrackModel, drivers: Sequence, n_simulations: int = 10000,
+                    engine: str = "scalar", batch_size: int = 50000, workers: int = 1,
+                    seed: Optional[int] = None,
+                    rng: Optional[np.random.Generator] = None,
+                    streaming: bool = False,
+                    target_half_width: Optional[float] = None,
+                    max_simulations: int = 10_000_000,
+                    rao_blackwell: bool = False,
+                    finishing_order: bool = False,
+                    instrument: Union[bool, Recorder] = False,
+                    progress: Optional[ProgressCallback] = None,
+                    progress_every: Optional[int] = None,
+                    progress_seconds: Optional[float] = None,
+                    cache: Union[bool, ResultCache, None] = None) -> Union[pd.DataFrame, RaceAccumulator]:
+    """Run a Monte Carlo simulation of any track model
+
+    engine="scalar" walks each race lap by lap with RaceSimulator;
+    engine="events" runs the same simulator jumping from incident to incident;
+    engine="vectorized" runs BatchSimulator in batches of batch_size;
+    engine="compiled" runs the Numba kernel (simulators.kernel) in batches,
+    or the vectorized engine if Numba is not installed.
+
+    The run is split into one chunk per worker, each with its own child of
+    SeedSequence(seed), so (seed, n_simulations, workers) is reproducible.
+    Pass rng instead of seed to derive the run's seed from a Generator.
+
+    streaming=True returns a RaceAccumulator (O(drivers) memory) instead of
+    one DataFrame row per race.
+
+    rao_blackwell=True (implies streaming) averages each race's exact win
+    probabilities over its surviving field instead of counting the one
+    sampled winner - the same estimate with several times less variance, so
+    a target precision takes far fewer races.
+
+    finishing_order=True (implies streaming) also simulates every race's
+    full finishing order and counts it into the accumulator's
+    drivers x positions matrix.
+
+    target_half_width (e.g. 0.0025 for 0.25pp) switches to run-to-precision:
+    rounds of n_simulations races are added until every top-15 driver's 95%
+    Wilson interval is within +/- target_half_width, or max_simulations.
+
+    instrument=True (or a simulators.instrument.Recorder to fill) times the
+    run's phases and counts events and RNG draws, then prints a report.
+
+    progress receives simulators.progress.Progress records (races done,
+    sims/sec, ETA, current leader) every progress_every races (default a
+    quarter of the run) and/or progress_seconds apart; run-to-precision
+    reports once per round. Pass simulators.progress.console_progress to
+    print them. Nothing is printed by default.
+
+    cache=True (or a simulators.cache.ResultCache) returns a seeded run
+    from the on-disk result cache when the model, roster, engine and options
+    match, and extends a smaller cached run with only the missing races.
+    Runs without an integer seed, run-to-precision and instrumented runs are
+    not cached.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine!r} (expected one of {', '.join(ENGINES)})")
+
+    streaming = streaming or rao_blackwell or finishing_order
+    cache = as_result_cache(cache)
+    if (cache is not None and isinstance(seed, (int, np.integer)) and rng is None
+            and target_half_width is None and not instrument):
+        spec = cache_spec(model, drivers, engine, batch_size, streaming, rao_blackwell, finishing_order)
+        return run_cached(cache, spec, n_simulations, seed, workers, lambda n, seed_seq: run_monte_carlo(
+            model, drivers, n, engine=engine, batch_size=batch_size, workers=workers, seed=seed_seq,
+            streaming=streaming, rao_blackwell=rao_blackwell, finishing_order=finishing_order,
+            progress=progress, progress_every=progress_every, progress_seconds=progress_seconds
+        ))
+
+    # Every chunk builds frames or accumulators with pandas - import it here,
+    # before the workers fork, instead of once in each of them
+    import pandas  # noqa: F401
+
+    recorder = instrument if isinstance(instrument, Recorder) else (Recorder() if instrument else None)
+    start = perf_counter()
+
+    if target_half_width is not None:
+        tracker = ProgressTracker(progress, target_half_width=target_half_width) if progress else None
+        result = run_to_precision(
+            simulate_chunk, n_simulations, new_accumulator(model, drivers, rao_blackwell, finishing_order),
+            target_half_width, max_simulations=max_simulations, workers=workers, seed=seed, rng=rng,
+            args=(model, drivers, engine, batch_size, None, streaming, rao_blackwell, finishing_order,
+                  recorder is not None),
+            streaming=streaming, on_round_done=tracker.round_done if tracker else None, recorder=recorder
+        )
+    else:
+        tracker = ProgressTracker(progress, n_simulations, progress_every, progress_seconds) if progress else None
+        in_process = tracker is not None and workers == 1
+
+        def on_chunk_done(done, total, chunk):
+            tracker.update(done - tracker.done, chunk_winners(chunk if recorder is None else chunk[0]))
+
+        # An in-process chunk reports each batch; worker chunks report as they finish
+        chunks = run_parallel(
+            simulate_chunk, n_simulations, workers=workers, seed=seed, rng=rng,
+            args=(model, drivers, engine, batch_size, tracker.update if in_process else None,
+                  streaming, rao_blackwell, finishing_order, recorder is not None),
+            on_chunk_done=on_chunk_done if tracker and not in_process else None
+        )
+        if recorder is not None:
+            for _, chunk_recorder in chunks:
+                recorder.merge(chunk_recorder)
+            chunks = [chunk for chunk, _ in chunks]
+
+        with as_recorder(recorder).phase("merge"):
+            if streaming:
+                result = new_accumulator(model, drivers, rao_blackwell, finishing_order)
+                for chunk in chunks:
+                    result.merge(chunk)
+            else:
+                import pandas as pd
+                result = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+    if recorder is not None:
+        recorder.print_report(perf_counter() - start)
+    return result
+
+
+def as_accumulator(model: TrackModel, drivers: Sequence,
+                   results: Union[pd.DataFrame, RaceAccumulator]) -> RaceAccumulator:
+    """results as a RaceAccumulator - per-race frames are folded in"""
+    if isinstance(results, RaceAccumulator):
+        return results
+    return new_accumulator(model, drivers).update(results)
+
@@ -0,0 +1,157 @@
+"""
+Opt-in hot-path instrumentation
+
+A Recorder collects cumulative per-phase timers (setup, chaos phases,
+winner draw, finishing order, result and DataFrame builds) and counters
+(chaos events fired, RNG calls and variates drawn) from the simulators.
+Pass one to run_monte_carlo (instrument=True or a Recorder) to get a report
+at the end of the run.
+
+Instrumentation is off by default: simulators hold NULL_RECORDER, whose
+phase() is a shared no-op context and whose enabled flag lets the batch
+engine skip counting altogether. The RNG counting wrapper is only put in
+place for an enabled recorder, so a normal run draws from the bare
+Generator.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Recorder:
+    """Cumulative per-phase timers and named counters"""
+
+    enabled = True
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.races = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += perf_counter() - start
+            self.calls[name] += 1
+
+    def count(self, name: str, k: int = 1):
+        self.counters[name] += k
+
+    def add(self, name: str, seconds: float, calls: int = 1):
+        """Record a phase timed elsewhere - e.g. startup, before the recorder existed"""
+        self.seconds[name] += seconds
+        self.calls[name] += calls
+
+    def merge(self, other: "Recorder") -> "Recorder":
+        """Fold in another recorder (e.g. a worker's)"""
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+            self.calls[name] += other.calls[name]
+        for name, k in other.counters.items():
+            self.counters[name] += k
+        self.races += other.races
+        return self
+
+    def timers(self) -> pd.DataFrame:
+        """One row per phase: total seconds, calls, microseconds per race and share"""
+        import pandas as pd
+        names = sorted(self.seconds, key=self.seconds.get, reverse=True)
+        seconds = np.array([self.seconds[n] for n in names])
+        total = seconds[[n.count(".") == 0 for n in names]].sum() if names else 0.0
+        return pd.DataFrame({
+            'seconds': seconds,
+            'calls': [self.calls[n] for n in names],
+            'us_per_race': seconds / max(self.races, 1) * 1e6,
+            'share': seconds / total if total > 0 else np.nan,
+        }, index=pd.Index(names, name='phase'))
+
+    def counts(self) -> pd.DataFrame:
+        """One row per counter: total and per race"""
+        import pandas as pd
+        names = sorted(self.counters)
+        totals = np.array([self.counters[n] for n in names], dtype=np.int64)
+        return pd.DataFrame({'total': totals, 'per_race': totals / max(self.races, 1)},
+                            index=pd.Index(names, name='counter'))
+
+    def print_report(self, wall_seconds: Optional[float] = None):
+        """Print timers and counters; wall_seconds is the run's own wall time
+
+        A recorded 'startup' phase ran before the run and takes a share of
+        the table, so it is added to the wall time - both then start where
+        startup did.
+        """
+        print(f"\n{'='*70}")
+        print(f"INSTRUMENTATION ({self.races:,} races)")
+        print(f"{'='*70}")
+        if wall_seconds is not None:
+            startup = self.seconds.get("startup", 0.0)
+            parts = f"{startup:.3f}s startup + {wall_seconds:.3f}s run; " if startup else ""
+            print(f"Wall time: {startup + wall_seconds:.3f}s ({parts}phase times are summed over workers)")
+        print(f"{'Phase':<32} {'Seconds':>9} {'Calls':>10} {'us/race':>9} {'Share':>7}")
+        print("-" * 70)
+        for name, row in self.timers().iterrows():
+            share = f"{row['share']:>6.1%}" if name.count(".") == 0 else f"{'':>6}"
+            print(f"{name:<32} {row['seconds']:>9.3f} {int(row['calls']):>10,} "
+                  f"{row['us_per_race']:>9.2f} {share:>7}")
+        print(f"\n{'Counter':<32} {'Total':>14} {'Per race':>10}")
+        print("-" * 70)
+        for name, row in self.counts().iterrows():
+            print(f"{name:<32} {int(row['total']):>14,} {row['per_race']:>10.2f}")
+
+
+class NullRecorder:
+    """Recorder stand-in that does nothing - the default everywhere"""
+
+    enabled = False
+    _null = nullcontext()
+
+    def phase(self, name: str):
+        return self._null
+
+    def count(self, name: str, k: int = 1):
+        pass
+
+
+NULL_RECORDER = NullRecorder()
+
+
+def as_recorder(recorder) -> "Recorder":
+    return NULL_RECORDER if recorder is None else recorder
+
+
+class CountingGenerator:
+    """numpy Generator proxy counting calls and variates per method
+
+    Only used for an enabled Recorder: counters 'rng.<method>' (calls) and
+    'rng.variates' (values drawn).
+    """
+
+    def __init__(self, generator: np.random.Generator, recorder: Recorder):
+        self.generator = generator
+        self.recorder = recorder
+
+    def __getattr__(self, name: str):
+        method = getattr(self.generator, name)
+        if not callable(method):
+            return method
+        counters = self.recorder.counters
+
+        def counted(*args, **kwargs):
+            value = method(*args, **kwargs)
+            counters[f"rng.{name}"] += 1
+            counters["rng.variates"] += np.size(value)
+            return value
+        return counted
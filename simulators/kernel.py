@@ -0,0 +1,298 @@
+"""
+Compiled race kernel - the optional engine="compiled"
+
+Runs the complete per-race state machine (lap loop, once events, damage,
+scenario-boosted winner draw, finishing order) for a batch of races over
+plain arrays, with Numba's @njit and the batch split across threads by
+prange. Each block of races reseeds the thread's generator from a seed
+drawn up front, so a (seed, n) run gives the same races whatever the
+thread count.
+
+Numba is optional. Without it the kernel below is still valid Python (slow,
+but handy for checking it against the other engines); engine="compiled"
+then falls back to the NumPy BatchSimulator - see
+simulators.engine.batch_simulator.
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from simulators.engine import batch_results, compile_model
+from simulators.instrument import Recorder, as_recorder
+from simulators.rng import as_generator
+from simulators.roster import Roster, as_roster
+from simulators.track_model import TrackModel
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# Races per reseed - a block runs on one thread
+BLOCK_SIZE = 256
+
+
+@njit(cache=True)
+def _fire(e, lap, running, incidents, retired, picked, collects, size_lo, size_hi, weights,
+          terminal, spare):
+    """Chaos event e on lap: collect its cars; False if there was nobody to collect"""
+    if not collects[e]:
+        return True
+    n_drivers = running.shape[0]
+    n_running = 0
+    for i in range(n_drivers):
+        if running[i]:
+            n_running += 1
+    if n_running == 0:
+        return False
+
+    size = size_lo[e] + int(np.random.random() * (size_hi[e] - size_lo[e] + 1))
+    if n_running < size:
+        size = max(n_running - spare[e], 0)
+
+    # Successive weighted draws without replacement
+    picked[:] = False
+    for _ in range(min(size, n_running)):
+        total = 0.0
+        for i in range(n_drivers):
+            if running[i] and not picked[i]:
+                total += weights[e, i]
+        target = np.random.random() * total
+        cum = 0.0
+        choice = -1
+        for i in range(n_drivers):
+            if running[i] and not picked[i]:
+                cum += weights[e, i]
+                choice = i
+                if cum > target:
+                    break
+        picked[choice] = True
+
+    for i in range(n_drivers):
+        if picked[i]:
+            if terminal[e] >= 1.0 or np.random.random() < terminal[e]:
+                running[i] = False
+                retired[i] = lap
+            else:
+                incidents[i] += 1  # Damaged but running
+    return True
+
+
+@njit(cache=True)
+def _winner(running, incidents, flags, scores, win_scores, boosts, has_boost, damage, floor, has_floor):
+    """Winner index: categorical draw over the scored running field
+
+    Leaves the draw weights in scores (all zero if nobody is running).
+    """
+    n_drivers = running.shape[0]
+    total = 0.0
+    for i in range(n_drivers):
+        s = 0.0
+        if running[i]:
+            s = win_scores[i]
+            for e in range(has_boost.shape[0]):
+                if has_boost[e] and flags[e]:
+                    s *= boosts[e, i]
+            if damage != 0.0:
+                s *= 1.0 - incidents[i] * damage
+            if has_floor:
+                s = max(floor, s)
+        scores[i] = s
+        total += s
+
+    # Nobody running - uniform over the whole field, as the other engines
+    if total <= 0.0:
+        return int(np.random.random() * n_drivers)
+    target = np.random.random() * total
+    cum = 0.0
+    for i in range(n_drivers):
+        cum += scores[i]
+        if cum > target:
+            return i
+    return n_drivers - 1
+
+
+@njit(cache=True)
+def _finish(running, retired, scores, winner, key, order):
+    """Fill order with the finishing order: winner, running cars by
+    Plackett-Luce (Gumbel keys), then retirements latest first"""
+    n_drivers = running.shape[0]
+    for i in range(n_drivers):
+        u = np.random.random()
+        if i == winner:
+            key[i] = np.inf
+        elif not running[i]:
+            key[i] = retired[i] + u
+        elif scores[i] > 0.0:
+            key[i] = np.log(scores[i]) - np.log(-np.log(u))
+        else:
+            key[i] = -np.inf
+    by_key = np.argsort(-key)
+    pos = 0
+    for j in range(n_drivers):
+        if running[by_key[j]] or by_key[j] == winner:
+            order[pos] = by_key[j]
+            pos += 1
+    for j in range(n_drivers):
+        if not (running[by_key[j]] or by_key[j] == winner):
+            order[pos] = by_key[j]
+            pos += 1
+
+
+@njit(parallel=True, cache=True)
+def _run_batch(block_seeds, block_size, total_laps, is_stage,
+               first, last, once, probs, collects, size_lo, size_hi, weights, terminal, spare,
+               win_scores, boosts, has_boost, damage, floor, has_floor,
+               winners, flags, laps, cautions, finishers, probs_out, order_out):
+    """Fill the per-race output arrays for len(winners) races
+
+    probs_out (win probabilities) and order_out (finishing orders) are
+    (races x drivers), or have no rows to skip them.
+    """
+    n = winners.shape[0]
+    n_drivers = win_scores.shape[0]
+    n_events = first.shape[0]
+
+    for b in prange(block_seeds.shape[0]):
+        np.random.seed(block_seeds[b])
+        running = np.empty(n_drivers, dtype=np.bool_)
+        incidents = np.empty(n_drivers, dtype=np.int64)
+        retired = np.empty(n_drivers, dtype=np.int64)
+        key = np.empty(n_drivers)
+        picked = np.empty(n_drivers, dtype=np.bool_)
+        scores = np.empty(n_drivers)
+        spent = np.empty(n_events, dtype=np.bool_)
+
+        for r in range(b * block_size, min((b + 1) * block_size, n)):
+            running[:] = True
+            incidents[:] = 0
+            retired[:] = 0
+            spent[:] = False
+            c = 0
+
+            for lap in range(1, total_laps + 1):
+                for e in range(n_events):
+                    if spent[e] or lap < first[e] or lap > last[e]:
+                        continue
+                    if np.random.random() < probs[e, lap - first[e]]:
+                        if once[e]:
+                            spent[e] = True
+                        if _fire(e, lap, running, incidents, retired, picked, collects,
+                                 size_lo, size_hi, weights, terminal, spare):
+                            if not flags[r, e]:
+                                laps[r, e] = lap
+                            flags[r, e] = True
+                            c += 1
+                if is_stage[lap]:
+                    c += 1
+
+            cautions[r] = c
+            finishers[r] = running.sum()
+            winners[r] = _winner(running, incidents, flags[r], scores, win_scores, boosts,
+                                 has_boost, damage, floor, has_floor)
+            if probs_out.shape[0] > 0:
+                total = scores.sum()
+                for i in range(n_drivers):
+                    probs_out[r, i] = scores[i] / total if total > 0.0 else 1.0 / n_drivers
+            if order_out.shape[0] > 0:
+                _finish(running, retired, scores, winners[r], key, order_out[r])
+
+
+class KernelSimulator:
+    """Compiled engine - a batch of races, each run lap by lap in the kernel
+
+    Same race rules and simulate_races columns as BatchSimulator. A
+    recorder only sees the kernel as one phase - events and RNG draws
+    happen inside it and are not counted.
+    """
+
+    def __init__(self, model: TrackModel, drivers: Union[Sequence, Roster],
+                 rng: np.random.Generator = None, block_size: int = BLOCK_SIZE,
+                 recorder: Optional[Recorder] = None):
+        roster = as_roster(drivers)
+        compiled = compile_model(model, roster)
+        self.model = model
+        self.roster = roster
+        self.drivers = roster.drivers
+        self.rng = as_generator(rng)
+        self.block_size = block_size
+        self.recorder = as_recorder(recorder)
+
+        chaos = model.chaos
+        n_events = len(chaos)
+        max_window = max((len(p) for p in compiled.lap_probs), default=0)
+        self.is_stage = np.zeros(model.total_laps + 1, dtype=bool)
+        self.is_stage[[lap for lap in model.stage_breaks if lap <= model.total_laps]] = True
+
+        self.first = np.array([w[0] for w in compiled.windows], dtype=np.int64)
+        self.last = np.array([w[1] for w in compiled.windows], dtype=np.int64)
+        self.once = np.array([e.once for e in chaos], dtype=bool)
+        self.probs = np.zeros((n_events, max(max_window, 1)))
+        for e, p in enumerate(compiled.lap_probs):
+            self.probs[e, :len(p)] = p
+        self.collects = np.array([e.collects for e in chaos], dtype=bool)
+        self.size_lo = np.array([e.size[0] for e in chaos], dtype=np.int64)
+        self.size_hi = np.array([e.size[1] for e in chaos], dtype=np.int64)
+        self.weights = np.array(compiled.chaos_weights).reshape(n_events, len(roster))
+        self.terminal = np.array([e.terminal for e in chaos], dtype=float)
+        self.spare = np.array([e.spare for e in chaos], dtype=np.int64)
+
+        # Scenario boosts by chaos event index
+        self.boosts = np.ones((n_events, len(roster)))
+        self.has_boost = np.zeros(n_events, dtype=bool)
+        for e, event in enumerate(chaos):
+            if event.name in compiled.boosts:
+                self.boosts[e] = compiled.boosts[event.name]
+                self.has_boost[e] = True
+        self.win_scores = compiled.win_scores
+        self.damage = float(model.win.damage)
+        self.has_floor = model.win.floor is not None
+        self.floor = float(model.win.floor) if self.has_floor else 0.0
+
+    def simulate_races(self, n_sims: int, win_probs: bool = False,
+                       finishing_order: bool = False) -> Dict[str, np.ndarray]:
+        """Run a batch of races, returning one array per simulate_race column
+
+        win_probs=True adds the (n_sims x drivers) 'win_probs' matrix,
+        finishing_order=True the 'finishing_order' one.
+        """
+        n_events = len(self.model.chaos)
+        n_blocks = -(-n_sims // self.block_size)
+        block_seeds = self.rng.integers(0, 2**32, size=n_blocks, dtype=np.int64)
+
+        winners = np.zeros(n_sims, dtype=np.int64)
+        flags = np.zeros((n_sims, n_events), dtype=bool)
+        laps = np.zeros((n_sims, n_events), dtype=np.int64)
+        cautions = np.zeros(n_sims, dtype=np.int64)
+        finishers = np.zeros(n_sims, dtype=np.int64)
+        probs = np.zeros((n_sims if win_probs else 0, len(self.roster)))
+        order = np.zeros((n_sims if finishing_order else 0, len(self.roster)), dtype=np.int64)
+
+        with self.recorder.phase("kernel"):
+            _run_batch(block_seeds, self.block_size, self.model.total_laps, self.is_stage,
+                       self.first, self.last, self.once, self.probs, self.collects,
+                       self.size_lo, self.size_hi, self.weights, self.terminal, self.spare,
+                       self.win_scores, self.boosts, self.has_boost, self.damage, self.floor,
+                       self.has_floor, winners, flags, laps, cautions, finishers, probs, order)
+
+        with self.recorder.phase("results"):
+            chaos = {}
+            for e, event in enumerate(self.model.chaos):
+                if event.flag:
+                    chaos[event.name] = flags[:, e]
+                if event.record_lap:
+                    chaos[f"{event.name}_lap"] = np.where(flags[:, e], laps[:, e], np.nan)
+            result = batch_results(self.model, self.roster, winners, chaos, cautions, finishers)
+        if win_probs:
+            result['win_probs'] = probs
+        if finishing_order:
+            result['finishing_order'] = order
+        return result
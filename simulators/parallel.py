@@ -0,0 +1,68 @@
+"""
+Parallel Monte Carlo runner
+
+Splits a run into one chunk per worker, gives every chunk its own child of a
+single numpy SeedSequence and runs the chunks on a ProcessPoolExecutor.
+Results come back in chunk order, so a (seed, n, workers) triple always
+merges to the same result no matter which worker finishes first.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from simulators.rng import root_seed_sequence
+
+
+def split_simulations(n_simulations: int, n_chunks: int) -> List[int]:
+    """Split n_simulations into n_chunks near-equal chunk sizes"""
+    base, extra = divmod(n_simulations, n_chunks)
+    return [base + (1 if i < extra else 0) for i in range(n_chunks)]
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def run_parallel(task: Callable, n_simulations: int, workers: int = 1,
+                 seed: Optional[int] = None, args: tuple = (),
+                 on_chunk_done: Callable[[int, int, object], None] = None,
+                 rng: Optional[np.random.Generator] = None) -> List:
+    """Run task(chunk_size, seed_seq, *args) for every chunk, results in chunk order
+
+    task must be a module-level function so it can be pickled. workers=1 runs
+    the single chunk in-process. on_chunk_done(sims_done, n_simulations, result)
+    is called in the parent as chunks finish. Passing rng instead of seed draws
+    the root seed from that Generator.
+    """
+    workers = max(1, workers or default_workers())
+    sizes = split_simulations(n_simulations, workers)
+    seeds = root_seed_sequence(seed, rng).spawn(workers)
+    chunks = [(i, size, seeds[i]) for i, size in enumerate(sizes) if size > 0]
+
+    results = [None] * len(chunks)
+    done = 0
+
+    if workers == 1:
+        for slot, (_, size, child) in enumerate(chunks):
+            results[slot] = task(size, child, *args)
+            done += size
+            if on_chunk_done:
+                on_chunk_done(done, n_simulations, results[slot])
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(task, size, child, *args): (slot, size)
+            for slot, (_, size, child) in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            slot, size = futures[future]
+            results[slot] = future.result()
+            done += size
+            if on_chunk_done:
+                on_chunk_done(done, n_simulations, results[slot])
+
+    return results
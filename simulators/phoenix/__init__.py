@@ -0,0 +1 @@
+"""Phoenix Raceway flat-track models"""
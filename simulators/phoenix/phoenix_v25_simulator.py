@@ -5,11 +5,29 @@ Straight Talk Wireless 500 - March 8, 2026
 MODEL v2.5: HOT HAND + REGRESSION TO MEAN
 """
 
+from __future__ import annotations
+
+import sys
+
+if not __package__:
+    # Run as a script (python simulators/phoenix/phoenix_v25_simulator.py): import the package from the repo root
+    from pathlib import Path
+    sys.path[0] = str(Path(__file__).resolve().parents[2])
+
 import numpy as np
-import pandas as pd
-from dataclasses import dataclass
-from typing import List, Dict
-import random
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Dict, List, Union
+
+from simulators.cache import ResultCache, as_result_cache, extend_result, run_cached
+from simulators.config import data_path, load_track_files
+from simulators.engine import compile_model
+from simulators.parallel import run_parallel
+from simulators.rng import RaceRNG, as_race_rng, root_seed_sequence
+from simulators.roster import Roster, as_roster
+from simulators.track_model import Multiplier, TrackModel
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 @dataclass
 class PhoenixDriver:
@@ -25,82 +43,199 @@ class PhoenixDriver:
     points_position: int = 99
     running: bool = True
 
-# Driver profiles
-PHOENIX_DRIVERS = [
-    PhoenixDriver("Tyler Reddick", 45, "23XI", 8.5, 8.5, 8.5, 9.0, 10.0, 3, 1),
-    PhoenixDriver("Kyle Larson", 5, "Hendrick", 9.5, 9.5, 9.0, 9.5, 6.0, 0, 5),
-    PhoenixDriver("Christopher Bell", 20, "Joe Gibbs", 9.0, 9.0, 9.0, 9.0, 5.0, 0, 8),
-    PhoenixDriver("William Byron", 24, "Hendrick", 8.5, 8.5, 8.5, 8.5, 4.5, 0, 10),
-    PhoenixDriver("Denny Hamlin", 11, "Joe Gibbs", 8.5, 8.5, 8.5, 9.5, 6.0, 0, 4),
-    PhoenixDriver("Chase Elliott", 9, "Hendrick", 8.0, 8.0, 8.5, 8.5, 5.0, 0, 12),
-    PhoenixDriver("Ryan Blaney", 12, "Penske", 8.5, 8.5, 8.0, 9.5, 5.5, 0, 7),
-]
+# Model v2.5 and the driver profiles - data/models, data/rosters
+PHOENIX_MODEL, PHOENIX_DRIVERS = load_track_files(
+    data_path("models", "phoenix.toml"), data_path("rosters", "phoenix_2026.csv"), PhoenixDriver)
+MODEL_VERSION = PHOENIX_MODEL.version
+
+
+def _rule(field: str, low: float, high: float = np.inf) -> Multiplier:
+    """The model file's multiplier on field over [low, high] - there must be exactly one"""
+    rules = [rule for rule in PHOENIX_MODEL.win.multipliers
+             if rule.field == field and rule.low == low and rule.high == high]
+    if len(rules) != 1:
+        raise ValueError(f"phoenix.toml: expected one {field} multiplier for [{low}, {high}], "
+                         f"found {len(rules)}")
+    return rules[0]
+
+# The streak rules (1, 2, 3 and 4+ wins), the 3+ win long-streak penalty
+# (pressure x rarity) and the points-leader bonus, picked by field and bounds
+STREAK_RULES = tuple(_rule("consecutive_wins", wins, wins if wins < 4 else np.inf)
+                     for wins in range(1, 5))
+LONG_STREAK = _rule("consecutive_wins", 3)
+POINTS_LEADER = _rule("points_position", 1, 1)
+
+WEIGHTS = dict(PHOENIX_MODEL.win.weights)
 
 def calculate_streak_regression(consecutive_wins: int) -> float:
-    """Regression to mean for win streaks"""
-    if consecutive_wins == 0:
-        return 1.0
-    elif consecutive_wins == 1:
-        return 1.25
-    elif consecutive_wins == 2:
-        return 1.4
-    elif consecutive_wins == 3:
-        return 1.15  # Regression kicks in
-    elif consecutive_wins >= 4:
-        return 0.95
+    """Regression to mean for win streaks - the model file's streak rules"""
+    for rule in STREAK_RULES:
+        if rule.low <= consecutive_wins <= rule.high:
+            return rule.factor
     return 1.0
 
+def streak_multipliers(regression=calculate_streak_regression) -> tuple:
+    """Win-score multiplier rules for 1, 2, 3 and 4+ consecutive wins"""
+    return tuple(
+        Multiplier("consecutive_wins", regression(wins), low=wins,
+                   high=wins if wins < 4 else np.inf)
+        for wins in range(1, 5)
+    )
+
+def build_model(weights: Dict[str, float] = None, regression=None,
+                long_streak: float = None, points_leader: float = None) -> TrackModel:
+    """The Phoenix model with its tunables swapped out - e.g. for a sweep
+
+    weights override individual entries of WEIGHTS; regression maps a win
+    streak to its multiplier in place of the file's streak rules;
+    long_streak replaces the 3+ win pressure x rarity penalty and
+    points_leader the points-leader bonus. Anything left out keeps its
+    value from data/models/phoenix.toml, so build_model() is PHOENIX_MODEL.
+    """
+    swaps = {}
+    if regression is not None:
+        swaps.update(zip(STREAK_RULES, streak_multipliers(regression)))
+    if long_streak is not None:
+        swaps[LONG_STREAK] = replace(LONG_STREAK, factor=long_streak)
+    if points_leader is not None:
+        swaps[POINTS_LEADER] = replace(POINTS_LEADER, factor=points_leader)
+    return replace(PHOENIX_MODEL, win=replace(
+        PHOENIX_MODEL.win,
+        weights={**WEIGHTS, **(weights or {})},
+        multipliers=tuple(swaps.get(rule, rule) for rule in PHOENIX_MODEL.win.multipliers),
+    ))
+
+def v25_score(driver: PhoenixDriver) -> float:
+    """v2.5 formula with regression"""
+    return float(compile_model(PHOENIX_MODEL, Roster([driver])).win_scores[0])
+
+def _win_probabilities(roster: Roster) -> np.ndarray:
+    scores = compile_model(PHOENIX_MODEL, roster).win_scores
+    return scores / scores.sum()
+
 class PhoenixSimulator:
-    def __init__(self, drivers: List[PhoenixDriver]):
-        self.drivers = drivers
+    def __init__(self, drivers: Union[List[PhoenixDriver], Roster], rng: np.random.Generator = None):
+        # Pass one Roster to share the scores race after race
+        self.roster = as_roster(drivers)
+        self.drivers = self.roster.drivers
+        self.rng = as_race_rng(rng)
+    
+    def win_probabilities(self) -> np.ndarray:
+        """Exact win probability per driver - nothing in the race varies"""
+        return self.roster.derived(_win_probabilities)
         
     def determine_winner(self) -> PhoenixDriver:
-        """v2.5 formula with regression"""
-        scores = []
-        for driver in self.drivers:
-            score = (
-                driver.flat_track_skill * 0.20 +
-                driver.handling * 0.15 +
-                driver.tire_management * 0.15 +
-                driver.clutch_factor * 0.20 +
-                driver.recent_form * 0.30
-            )
-            
-            # Streak with regression
-            if driver.consecutive_wins > 0:
-                streak_boost = calculate_streak_regression(driver.consecutive_wins)
-                score *= streak_boost
-                
-                # Pressure penalty for long streaks
-                if driver.consecutive_wins >= 3:
-                    pressure = 0.88
-                    rarity = 0.88
-                    score *= pressure * rarity
-            
-            # Points leader
-            if driver.points_position == 1:
-                score *= 1.15
-                
-            scores.append(score)
-        
-        total = sum(scores)
-        probs = [s/total for s in scores]
-        return np.random.choice(self.drivers, p=probs)
+        """Single categorical draw over the v2.5 win probabilities"""
+        return self.rng.choices(self.drivers, self.win_probabilities())[0]
+    
+    def sample_winners(self, n: int) -> np.ndarray:
+        """Driver index of the winner of n races, drawn in one call"""
+        return self.rng.generator.choice(len(self.drivers), size=n, p=self.win_probabilities())
+    
+    def sample_win_counts(self, n: int) -> np.ndarray:
+        """Win count per driver over n races as one multinomial draw"""
+        return self.rng.generator.multinomial(n, self.win_probabilities())
     
     def simulate(self) -> str:
         winner = self.determine_winner()
         return winner.name
 
-def run_simulation(n=10000):
-    results = []
-    for _ in range(n):
-        sim = PhoenixSimulator(PHOENIX_DRIVERS)
-        results.append(sim.simulate())
+def win_table(counts: np.ndarray, probs: np.ndarray, names: List[str]) -> pd.DataFrame:
+    """Sampled vs exact win percentages, one row per driver"""
+    import pandas as pd
+    table = pd.DataFrame({
+        'wins': counts,
+        'win_pct': counts / max(counts.sum(), 1) * 100,
+        'exact_pct': probs * 100,
+    }, index=pd.Index(names, name='winner'))
+    return table.sort_values('exact_pct', ascending=False)
+
+def simulate_chunk(n: int, seed_seq: np.random.SeedSequence, engine: str):
+    """Winners (per-race codes) or win counts for one chunk of races - run_parallel's task"""
+    rng = RaceRNG(np.random.default_rng(seed_seq))
+    roster = Roster(PHOENIX_DRIVERS)
+    sim = PhoenixSimulator(roster, rng)
+    
+    if engine == "counts":
+        return sim.sample_win_counts(n)
+    if engine == "vectorized":
+        return sim.sample_winners(n)
+    
+    index = {d.name: i for i, d in enumerate(PHOENIX_DRIVERS)}
+    return np.array([index[PhoenixSimulator(roster, rng).simulate()] for _ in range(n)],
+                    dtype=np.int64)
+
+def _run_chunks(n: int, seed_seq: np.random.SeedSequence, engine: str, workers: int) -> np.ndarray:
+    """Winner codes of n races (win counts for engine="counts")"""
+    chunks = run_parallel(simulate_chunk, n, workers=workers, seed=seed_seq, args=(engine,))
+    if engine == "counts":
+        return np.sum(chunks, axis=0) if chunks else np.zeros(len(PHOENIX_DRIVERS), dtype=np.int64)
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+def simulate_winners(n=10000, engine="vectorized", workers=1, seed=None, rng=None,
+                     cache: Union[bool, ResultCache] = False) -> np.ndarray:
+    """Winner of each of n races as an index into PHOENIX_DRIVERS - or, for
+    engine="counts", the win count per driver. numpy only; run_simulation
+    describes the options.
+    """
+    if engine not in ("scalar", "vectorized", "counts"):
+        raise ValueError(f"Unknown engine: {engine!r} (expected 'scalar', 'vectorized' or 'counts')")
     
-    df = pd.DataFrame({'winner': results})
+    cache = as_result_cache(cache)
+    if cache is not None and isinstance(seed, (int, np.integer)) and rng is None:
+        spec = {'model': repr(PHOENIX_MODEL), 'drivers': [repr(d) for d in PHOENIX_DRIVERS],
+                'runner': "phoenix", 'engine': engine}
+        return run_cached(cache, spec, n, seed, workers,
+                          lambda size, seed_seq: _run_chunks(size, seed_seq, engine, workers),
+                          combine=np.add if engine == "counts" else extend_result)
+    return _run_chunks(n, root_seed_sequence(seed, rng), engine, workers)
+
+def win_counts(winners: np.ndarray, engine: str) -> np.ndarray:
+    """Win count per driver from simulate_winners' result"""
+    if engine == "counts":
+        return winners
+    return np.bincount(winners, minlength=len(PHOENIX_DRIVERS))
+
+def print_predictions(counts: np.ndarray, top_n: int = 10):
+    """Sampled vs exact win % of the top_n drivers by exact probability"""
+    probs = PhoenixSimulator(PHOENIX_DRIVERS).win_probabilities()
+    sampled = counts / max(counts.sum(), 1) * 100
     print("\nPHOENIX v2.5 PREDICTIONS:")
-    print(df['winner'].value_counts(normalize=True).head(10) * 100)
+    print(f"{'Driver':<25} {'Sampled %':>10} {'Exact %':>10}")
+    for i in np.argsort(-probs, kind="stable")[:top_n]:
+        print(f"{PHOENIX_DRIVERS[i].name:<25} {sampled[i]:>9.2f}% {probs[i] * 100:>9.2f}%")
+
+def run_simulation(n=10000, engine="vectorized", workers=1, seed=None, rng=None,
+                   cache: Union[bool, ResultCache] = False):
+    """Run the Phoenix v2.5 model
+    
+    engine="vectorized" (the default) draws all n winners with a single
+    Generator.choice; engine="scalar" draws one race per PhoenixSimulator,
+    the reference loop to check it against. Both return one row per race.
+    engine="counts" draws the per-driver win counts as one multinomial and
+    returns the win_table instead - use it for very large n.
+    
+    Races are split across workers with SeedSequence(seed) child streams, so
+    (seed, n, workers) is reproducible. A Generator passed as rng seeds the
+    run instead of seed.
+    
+    cache=True (or a simulators.cache.ResultCache) keeps the winners of a
+    seeded run on disk and extends a smaller cached run with only the
+    missing races.
+    """
+    import pandas as pd
+    winners = simulate_winners(n, engine, workers, seed, rng, cache)
+    counts = win_counts(winners, engine)
+    print_predictions(counts)
+    
+    names = [d.name for d in PHOENIX_DRIVERS]
+    if engine == "counts":
+        return win_table(counts, PhoenixSimulator(PHOENIX_DRIVERS).win_probabilities(), names)
+    df = pd.DataFrame({'winner': pd.Categorical.from_codes(winners, names)})
+    if engine == "scalar":
+        df['winner'] = df['winner'].astype(str)
     return df
 
 if __name__ == "__main__":
-    run_simulation()
+    from simulators.cli import main
+    sys.exit(main(["run", "phoenix", *sys.argv[1:]]))
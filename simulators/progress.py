@@ -0,0 +1,131 @@
+"""
+Run progress as structured records
+
+The runners report progress to any callable as Progress records - races
+done, throughput, ETA and the current leader's running win probability -
+instead of printing. A ProgressTracker turns the runners' per-batch and
+per-chunk updates into records at a configurable interval (every so many
+races and/or seconds); console_progress is the adapter that prints them,
+and a scheduler or metrics sink can take them instead.
+
+    run_monte_carlo(model, drivers, 1_000_000, engine="vectorized",
+                    progress=lambda p: metrics.send(p.to_dict()), progress_seconds=30)
+"""
+
+from collections import Counter
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Callable, Iterable, Mapping, Optional, Union
+
+from simulators.accumulator import RaceAccumulator
+
+
+@dataclass(frozen=True)
+class Progress:
+    """One progress report of a run
+
+    total is None for open-ended (run-to-precision) runs, which report the
+    widest top-15 half-width and its target instead.
+    """
+    done: int
+    total: Optional[int]
+    elapsed: float
+    leader: Optional[str] = None
+    leader_win_probability: Optional[float] = None
+    half_width: Optional[float] = None
+    target_half_width: Optional[float] = None
+
+    @property
+    def sims_per_second(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the current rate (None if unknown)"""
+        if self.total is None or self.sims_per_second == 0:
+            return None
+        return (self.total - self.done) / self.sims_per_second
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), 'sims_per_second': self.sims_per_second, 'eta': self.eta}
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+def console_progress(progress: Progress):
+    """Print a progress record as one line - the console adapter"""
+    if progress.half_width is not None:
+        line = f"Progress: {progress.done:,} sims, widest top-15 95% CI +/-{progress.half_width:.2%}"
+        if progress.target_half_width is not None:
+            line += f" (target +/-{progress.target_half_width:.2%})"
+    elif progress.total:
+        line = f"Progress: {progress.done:,}/{progress.total:,} ({progress.done / progress.total * 100:.0f}%)"
+    else:
+        line = f"Progress: {progress.done:,} sims"
+
+    line += f" | {progress.sims_per_second:,.0f} sims/s"
+    if progress.eta is not None and progress.done < progress.total:
+        line += f", ETA {progress.eta:.1f}s"
+    if progress.leader is not None:
+        line += f" | leader {progress.leader} {progress.leader_win_probability:.1%}"
+    print(line, flush=True)
+
+
+def chunk_winners(result: Union[RaceAccumulator, Mapping]) -> Union[Mapping, Iterable]:
+    """A chunk result's winners for ProgressTracker.update: the winner
+    column of a frame, or name -> wins of an accumulator"""
+    if isinstance(result, RaceAccumulator):
+        return dict(zip(result.names, result.wins.tolist()))
+    return result['winner']
+
+
+class ProgressTracker:
+    """Counts a run's finished races and winners, reporting to callback
+    every `every` races (default a quarter of the run) and/or `seconds`
+    apart, and when the run completes"""
+
+    def __init__(self, callback: ProgressCallback, total: Optional[int] = None,
+                 every: Optional[int] = None, seconds: Optional[float] = None,
+                 target_half_width: Optional[float] = None):
+        self.callback = callback
+        self.total = total
+        self.every = every or (max(total // 4, 1) if total and seconds is None else None)
+        self.seconds = seconds
+        self.target_half_width = target_half_width
+        self.done = 0
+        self.wins = Counter()
+        self.start = self._last = perf_counter()
+        self._next = self.every
+
+    def update(self, races: int, winners: Union[Mapping, Iterable] = ()):
+        """races more finished; winners are their winner names (or name -> wins)"""
+        self.done += races
+        self.wins.update(winners)
+
+        now = perf_counter()
+        due = self.total is not None and self.done >= self.total
+        if self._next is not None and self.done >= self._next:
+            due = True
+            self._next += self.every * ((self.done - self._next) // self.every + 1)
+        if self.seconds is not None and now - self._last >= self.seconds:
+            due = True
+        if due:
+            self.emit(now=now)
+
+    def round_done(self, accumulator: RaceAccumulator, half_width: float):
+        """A run-to-precision round finished - report the accumulator so far"""
+        self.done = accumulator.n_races
+        self.wins = Counter(chunk_winners(accumulator))
+        self.emit(half_width)
+
+    def emit(self, half_width: Optional[float] = None, now: Optional[float] = None):
+        now = perf_counter() if now is None else now
+        leader, wins = self.wins.most_common(1)[0] if self.wins else (None, 0)
+        self._last = now
+        self.callback(Progress(
+            done=self.done, total=self.total, elapsed=now - self.start, leader=leader,
+            leader_win_probability=wins / self.done if leader is not None and self.done else None,
+            half_width=half_width,
+            target_half_width=self.target_half_width if half_width is not None else None,
+        ))
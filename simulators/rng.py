@@ -0,0 +1,93 @@
+"""
+Random number plumbing shared by the simulators
+
+Every simulator draws from a numpy Generator. The scalar (one race at a time)
+engines wrap it in a RaceRNG, which pre-generates uniforms in blocks and hands
+them out one by one - a per-lap roll then costs a list lookup instead of a
+Generator call.
+"""
+
+import math
+from bisect import bisect
+from itertools import accumulate
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+
+class RaceRNG:
+    """Block-buffered uniforms from a numpy Generator, stdlib-style helpers"""
+
+    def __init__(self, generator: np.random.Generator = None, block_size: int = 4096):
+        self.generator = generator if generator is not None else np.random.default_rng()
+        self.block_size = block_size
+        self._block = []
+        self._pos = 0
+        self._blocks = 0
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)"""
+        if self._pos == len(self._block):
+            self._block = self.generator.random(self.block_size).tolist()
+            self._pos = 0
+            self._blocks += 1
+        u = self._block[self._pos]
+        self._pos += 1
+        return u
+
+    def uniforms_used(self) -> int:
+        """Uniforms handed out so far - counted per block, not per draw"""
+        return self._blocks * self.block_size - (len(self._block) - self._pos)
+
+    def randint(self, a: int, b: int) -> int:
+        """Integer in [a, b], both ends included"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq: Sequence):
+        return seq[int(self.random() * len(seq))]
+
+    def choices(self, population: Sequence, weights: Sequence[float], k: int = 1) -> List:
+        """k weighted draws WITH replacement"""
+        cum_weights = list(accumulate(weights))
+        total = cum_weights[-1]
+        hi = len(population) - 1
+        return [population[min(bisect(cum_weights, self.random() * total), hi)]
+                for _ in range(k)]
+
+    def sample(self, population: Sequence, weights: Sequence[float], k: int) -> List:
+        """k distinct items, each draw proportional to the remaining weights"""
+        pool = list(population)
+        weights = list(weights)
+        picked = []
+        for _ in range(min(k, len(pool))):
+            i = self.choices(range(len(pool)), weights)[0]
+            picked.append(pool.pop(i))
+            weights.pop(i)
+        return picked
+
+    def geometric(self, p: float) -> int:
+        """Trials up to and including the first success (>= 1)"""
+        return int(math.log(1.0 - self.random()) / math.log(1.0 - p)) + 1
+
+
+def as_race_rng(rng: Union[RaceRNG, np.random.Generator, None]) -> RaceRNG:
+    """Accept a Generator (or an existing RaceRNG) wherever a simulator takes rng"""
+    if isinstance(rng, RaceRNG):
+        return rng
+    return RaceRNG(rng)
+
+
+def as_generator(rng: Union[RaceRNG, np.random.Generator, None]) -> np.random.Generator:
+    if isinstance(rng, RaceRNG):
+        return rng.generator
+    return rng if rng is not None else np.random.default_rng()
+
+
+def root_seed_sequence(seed: Union[int, np.random.SeedSequence, None] = None,
+                       rng: Optional[np.random.Generator] = None) -> np.random.SeedSequence:
+    """SeedSequence for a run - from an explicit seed, or drawn from a Generator"""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if rng is not None:
+        return np.random.SeedSequence(rng.integers(0, 2**63, size=4).tolist())
+    return np.random.SeedSequence(seed)
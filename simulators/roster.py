@@ -0,0 +1,101 @@
+"""
+Struct-of-arrays driver roster
+
+The driver dataclasses (AtlantaDriver, COTADriver, ...) stay the input
+format. A Roster is built from a list of them once: every numeric attribute
+(int or float) becomes one contiguous float array, and the per-race state (running,
+crashes, incidents, laps led, retirement lap) lives in small arrays that are
+reset in place between races - a race no longer copies a dataclass per driver.
+"""
+
+from dataclasses import fields
+from typing import Callable, Sequence, Union, get_type_hints
+
+import numpy as np
+
+# Dataclass fields that are per-race state rather than driver attributes
+STATE_FIELDS = ("running", "laps_led", "involved_in_crash", "incidents", "pit_strategy")
+
+# Identifying fields, kept out of the numeric attributes
+LABEL_FIELDS = ("name", "car_num", "team", "manufacturer", "tier")
+
+
+class Roster:
+    """Driver attributes as arrays (roster.aggression[i] is driver i's aggression)
+
+    Labels (names, manufacturers, teams, tiers) are object arrays - None
+    where a driver class has no such field - and numeric attributes float
+    arrays, both in roster order. The state arrays belong to
+    whichever race is currently running on this roster - reset() starts a new one.
+    """
+
+    def __init__(self, drivers: Sequence):
+        self.drivers = list(drivers)
+        if not self.drivers:
+            raise ValueError("Roster needs at least one driver")
+
+        self.names = np.array([d.name for d in self.drivers], dtype=object)
+        self.manufacturers = np.array([getattr(d, "manufacturer", None) for d in self.drivers], dtype=object)
+        self.teams = np.array([getattr(d, "team", None) for d in self.drivers], dtype=object)
+        self.tiers = np.array([getattr(d, "tier", None) for d in self.drivers], dtype=object)
+        self.car_nums = np.array([d.car_num for d in self.drivers])
+
+        self.attributes = []
+        # Resolved hints - field.type is a string in modules with postponed annotations
+        hints = get_type_hints(type(self.drivers[0]))
+        for field in fields(self.drivers[0]):
+            if hints[field.name] in (int, float) and field.name not in STATE_FIELDS + LABEL_FIELDS:
+                values = np.array([getattr(d, field.name) for d in self.drivers], dtype=float)
+                setattr(self, field.name, values)
+                self.attributes.append(field.name)
+
+        self._masks = {}
+        self._derived = {}
+
+        n = len(self.drivers)
+        self.running = np.ones(n, dtype=bool)
+        self.involved_in_crash = np.zeros(n, dtype=bool)
+        self.incidents = np.zeros(n, dtype=np.int64)
+        self.laps_led = np.zeros(n, dtype=np.int64)
+        self.retired_lap = np.zeros(n, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.drivers)
+
+    def reset(self) -> "Roster":
+        """Fresh race state: everyone running, no crashes, incidents, laps led or retirements"""
+        self.running.fill(True)
+        self.involved_in_crash.fill(False)
+        self.incidents.fill(0)
+        self.laps_led.fill(0)
+        self.retired_lap.fill(0)
+        return self
+
+    def matches(self, label: str, values: Sequence[str]) -> np.ndarray:
+        """Boolean mask of drivers whose label (e.g. "teams") is one of values, built once"""
+        key = (label, tuple(values))
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = np.isin(getattr(self, label), list(values))
+        return mask
+
+    def derived(self, build: Callable[..., object], *args):
+        """build(roster, *args), computed on first use and kept - for a model's static score vectors"""
+        key = (build, args)
+        if key not in self._derived:
+            self._derived[key] = build(self, *args)
+        return self._derived[key]
+
+    def running_indices(self) -> np.ndarray:
+        """Roster indices of the drivers still running"""
+        return self.running.nonzero()[0]
+
+    def n_running(self) -> int:
+        return int(np.count_nonzero(self.running))
+
+
+def as_roster(drivers: Union[Roster, Sequence]) -> Roster:
+    """Accept a list of driver dataclasses (or an existing Roster) wherever a simulator takes drivers"""
+    if isinstance(drivers, Roster):
+        return drivers
+    return Roster(drivers)
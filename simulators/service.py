@@ -0,0 +1,426 @@
+"""
+Local prediction service
+
+A stand-alone asyncio HTTP server (standard library only) that keeps every
+track model loaded and a process pool warm, so a prediction costs its races
+instead of a fresh interpreter, the numpy/pandas imports and a model load.
+
+    python -m simulators serve --port 8765 --workers 4 --seed 42
+
+    GET /predict/atlanta?n=100000&engine=vectorized           summary as JSON
+    GET /predict/atlanta?n=100000&engine=vectorized&stream=1  NDJSON: partial records, then the summary
+    GET /tracks
+    GET /health
+
+/predict takes n, engine (default vectorized), seed (default the service's),
+rao_blackwell and finishing_order. A run is split into chunks of at most
+chunk_size races - chunk i seeded by child i of SeedSequence(seed) - that
+run on the pool; every finished chunk is streamed as a partial record
+(progress and the running top-10 win table). Chunks are merged in order, so
+the result is that of run_monte_carlo(..., streaming=True, seed=seed,
+workers=<chunks>) whichever chunk finishes first.
+
+Identical requests arriving while a run is in flight join it instead of
+starting another (a streaming follower first gets the partial records
+already sent). Finished responses are kept in an in-memory LRU and, with
+cache=True, the aggregate in the on-disk ResultCache under the key a
+run_monte_carlo(cache=True) run of the same chunks uses.
+"""
+
+import asyncio
+import importlib
+import json
+import math
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from time import perf_counter
+from typing import AsyncIterator, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from simulators.accumulator import RaceAccumulator
+from simulators.cache import ResultCache, as_result_cache
+from simulators.engine import ENGINES, cache_spec, new_accumulator, resolve_engine, simulate_chunk
+from simulators.parallel import default_workers, split_simulations
+from simulators.progress import Progress, ProgressTracker, chunk_winners
+from simulators.storage import run_metadata
+from simulators.tracks import TRACKS, load_track
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_MAX_SIMULATIONS = 10_000_000
+DEFAULT_MEMORY_ENTRIES = 256
+
+# Engine batch size inside a chunk - run_monte_carlo's default, so a chunk is
+# the same races in both
+ENGINE_BATCH_SIZE = 50_000
+
+# Drivers in a partial record's win table
+PARTIAL_TOP_N = 10
+
+# track -> (module, summarize function); other tracks get the generic summary
+SUMMARIES = {
+    "atlanta": ("simulators.atlanta_recalibrated", "summarize_atlanta_results"),
+    "cota": ("simulators.cota_simulator", "summarize_cota_results"),
+}
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class PredictionRequest:
+    """Everything a prediction depends on - the coalescing and cache key"""
+    track: str
+    n_simulations: int
+    engine: str
+    seed: int
+    rao_blackwell: bool = False
+    finishing_order: bool = False
+
+
+def parse_request(track: str, query: Dict[str, List[str]], seed: int,
+                  max_simulations: int = DEFAULT_MAX_SIMULATIONS) -> PredictionRequest:
+    """PredictionRequest from a /predict query string (ValueError if invalid)"""
+    def value(name, default=None):
+        return query[name][-1] if name in query else default
+
+    if track not in TRACKS:
+        raise ValueError(f"Unknown track: {track!r} (expected one of {', '.join(TRACKS)})")
+    unknown = set(query) - {"n", "engine", "seed", "rao_blackwell", "finishing_order", "stream"}
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    engine = value("engine", "vectorized")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine!r} (expected one of {', '.join(ENGINES)})")
+    try:
+        n_simulations = int(value("n", 10_000))
+        seed = int(value("seed", seed))
+    except ValueError:
+        raise ValueError("n and seed must be integers") from None
+    if not 0 < n_simulations <= max_simulations:
+        raise ValueError(f"n must be between 1 and {max_simulations:,}")
+    if seed < 0:
+        raise ValueError("seed must be non-negative")
+    return PredictionRequest(
+        track, n_simulations, resolve_engine(engine), seed,
+        rao_blackwell=value("rao_blackwell", "").lower() in TRUE_VALUES,
+        finishing_order=value("finishing_order", "").lower() in TRUE_VALUES,
+    )
+
+
+def _warm(tracks: List[str]):
+    """Pool initializer: load every track model (and pandas) once per worker"""
+    import pandas  # noqa: F401
+    for name in tracks:
+        load_track(name)
+
+
+def _ping() -> bool:
+    return True
+
+
+def _simulate(track: str, n_simulations: int, seed_seq: np.random.SeedSequence, engine: str,
+              rao_blackwell: bool, finishing_order: bool) -> RaceAccumulator:
+    """One chunk of a prediction, on a pool worker"""
+    model, drivers = load_track(track)
+    return simulate_chunk(n_simulations, seed_seq, model, drivers, engine, ENGINE_BATCH_SIZE,
+                          streaming=True, rao_blackwell=rao_blackwell, finishing_order=finishing_order)
+
+
+def _records(frame) -> List[Dict]:
+    return frame.reset_index().to_dict('records')
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class _Job:
+    """A run in flight and the records it has published, for every request following it"""
+
+    def __init__(self):
+        self.records: List[Dict] = []
+        self.finished = False
+        self._changed = asyncio.Event()
+
+    def publish(self, record: Dict, final: bool = False):
+        self.records.append(record)
+        self.finished = final
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def follow(self) -> AsyncIterator[Dict]:
+        """Every record, from the first - earlier ones replayed - until the final one"""
+        seen = 0
+        while True:
+            changed = self._changed
+            while seen < len(self.records):
+                seen += 1
+                yield self.records[seen - 1]
+            if self.finished:
+                return
+            await changed.wait()
+
+
+class PredictionService:
+    """Warm track models and process pool behind /predict, with request
+    coalescing and cached responses
+
+    workers=0 means one per CPU; seed is the default root seed of a request
+    (drawn fresh when None); cache=True (or a ResultCache) also keeps the
+    aggregates on disk.
+    """
+
+    def __init__(self, workers: int = 1, seed: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_simulations: int = DEFAULT_MAX_SIMULATIONS,
+                 cache: Union[bool, ResultCache, None] = False,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.workers = max(1, workers or default_workers())
+        self.seed = int(np.random.SeedSequence().entropy if seed is None else seed)
+        self.chunk_size = chunk_size
+        self.max_simulations = max_simulations
+        self.cache = as_result_cache(cache)
+        self.memory_entries = memory_entries
+        self.counts = Counter()
+        self._memory: "OrderedDict[PredictionRequest, Dict]" = OrderedDict()
+        self._jobs: Dict[PredictionRequest, _Job] = {}
+        self._tasks = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Load the tracks, start and warm the pool, then listen (port=0 picks a free port)"""
+        tracks = list(TRACKS)
+        _warm(tracks)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm, initargs=(tracks,))
+        # Concurrent submits make the pool start every worker now, not on the first request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.workers)))
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # A cancelled run cancels its chunks that have not started
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    async def predict(self, request: PredictionRequest, stream: bool = False) -> AsyncIterator[Dict]:
+        """The records of a prediction: with stream=True every partial record,
+        then the result (or error) record
+
+        The result record's source says how it was served: "run", "coalesced"
+        (joined an identical run in flight), "memory" or "disk".
+        """
+        response = self._memory.get(request)
+        if response is not None:
+            self._memory.move_to_end(request)
+            self.counts['memory'] += 1
+            yield {**response, 'source': 'memory'}
+            return
+
+        job = self._jobs.get(request)
+        joined = job is not None
+        if joined:
+            self.counts['coalesced'] += 1
+        else:
+            job = self._jobs[request] = _Job()
+            task = asyncio.create_task(self._run(request, job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        async for record in job.follow():
+            if record['event'] == 'partial' and not stream:
+                continue
+            yield {**record, 'source': 'coalesced'} if joined and record['event'] == 'result' else record
+
+    async def _run(self, request: PredictionRequest, job: _Job):
+        try:
+            response, source = await self._simulate(request, job)
+        except Exception as exc:  # Reported to every request following the run
+            self.counts['errors'] += 1
+            job.publish({'event': 'error', 'error': f"{type(exc).__name__}: {exc}"}, final=True)
+        else:
+            self.counts[source] += 1
+            self._memory[request] = response
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+            job.publish({**response, 'source': source}, final=True)
+        finally:
+            del self._jobs[request]
+
+    async def _simulate(self, request: PredictionRequest, job: _Job):
+        """(response, source) - from the disk cache, or the chunks run on the pool"""
+        model, drivers = load_track(request.track)
+        n = request.n_simulations
+        sizes = split_simulations(n, math.ceil(n / self.chunk_size))
+        rb, fo = request.rao_blackwell, request.finishing_order
+        loop = asyncio.get_running_loop()
+
+        key = None
+        if self.cache is not None:
+            spec = cache_spec(model, drivers, request.engine, ENGINE_BATCH_SIZE, True, rb, fo)
+            key = self.cache.key({**spec, 'seed': request.seed, 'workers': len(sizes)})
+            hit = await loop.run_in_executor(None, self.cache.get, key, n)
+            if hit is not None:
+                return self._response(request, hit[0], len(sizes)), 'disk'
+
+        seeds = np.random.SeedSequence(request.seed).spawn(len(sizes))
+        futures = [loop.run_in_executor(self._pool, _simulate, request.track, size, child,
+                                        request.engine, rb, fo)
+                   for size, child in zip(sizes, seeds)]
+        running = new_accumulator(model, drivers, rb, fo)
+        tracker = ProgressTracker(lambda progress: job.publish(self._partial(progress, running)),
+                                  total=n, every=1)
+        try:
+            for next_done in asyncio.as_completed(futures):
+                chunk = await next_done
+                running.merge(chunk)
+                tracker.update(chunk.n_races, chunk_winners(chunk))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        # Merged in chunk order, as run_monte_carlo does
+        result = new_accumulator(model, drivers, rb, fo)
+        for future in futures:
+            result.merge(future.result())
+        if key is not None:
+            try:
+                await loop.run_in_executor(None, self.cache.put, key, n, result,
+                                           {'children': len(sizes), 'segments': [n]})
+            except OSError:
+                pass  # Read-only or full cache directory - the response still counts
+        return self._response(request, result, len(sizes)), 'run'
+
+    @staticmethod
+    def _partial(progress: Progress, acc: RaceAccumulator) -> Dict:
+        from simulators.summary import win_table
+        return {'event': 'partial', 'progress': progress.to_dict(),
+                'wins': _records(win_table(acc, PARTIAL_TOP_N))}
+
+    @staticmethod
+    def _response(request: PredictionRequest, acc: RaceAccumulator, chunks: int) -> Dict:
+        model, _ = load_track(request.track)
+        if request.track in SUMMARIES:
+            module, function = SUMMARIES[request.track]
+            summary = getattr(importlib.import_module(module), function)(acc)
+        else:
+            from simulators.summary import summarize
+            summary = summarize(acc, f"{request.track.upper()} PREDICTIONS")
+        metadata = run_metadata(request.track, model.version, acc.n_races, engine=request.engine,
+                                seed=request.seed, workers=chunks, rao_blackwell=request.rao_blackwell,
+                                finishing_order=request.finishing_order)
+        return {'event': 'result', 'metadata': metadata, 'summary': summary.to_dict()}
+
+    def health(self) -> Dict:
+        return {'status': 'ok', 'workers': self.workers, 'seed': self.seed,
+                'chunk_size': self.chunk_size, 'in_flight': len(self._jobs),
+                'memory_entries': len(self._memory), 'disk_cache': self.cache is not None,
+                'served': dict(self.counts)}
+
+    # HTTP
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await self._respond(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away - a run it started carries on for the others
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        except ValueError:
+            return await _send_json(writer, HTTPStatus.BAD_REQUEST, {'error': "Malformed request line"})
+        while (await reader.readline()).strip():
+            pass  # Headers - nothing here depends on them
+
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        if method != "GET":
+            return await _send_json(writer, HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Only GET is supported"})
+        if parts == ["health"]:
+            return await _send_json(writer, HTTPStatus.OK, self.health())
+        if parts == ["tracks"]:
+            tracks = []
+            for name in TRACKS:
+                model, drivers = load_track(name)
+                tracks.append({'name': name, 'model_version': model.version, 'drivers': len(drivers)})
+            return await _send_json(writer, HTTPStatus.OK, {'tracks': tracks})
+        if len(parts) != 2 or parts[0] != "predict":
+            return await _send_json(writer, HTTPStatus.NOT_FOUND, {'error': f"No route for {url.path}"})
+
+        query = parse_qs(url.query)
+        try:
+            request = parse_request(parts[1], query, self.seed, self.max_simulations)
+        except ValueError as exc:
+            return await _send_json(writer, HTTPStatus.BAD_REQUEST, {'error': str(exc)})
+
+        if query.get("stream", [""])[-1].lower() in TRUE_VALUES:
+            writer.write(_head(HTTPStatus.OK, "application/x-ndjson"))
+            async for record in self.predict(request, stream=True):
+                writer.write(json.dumps(record, default=_json_default).encode() + b"\n")
+                await writer.drain()
+            return
+
+        async for record in self.predict(request):
+            pass  # Only the final record without stream
+        status = HTTPStatus.OK if record['event'] == 'result' else HTTPStatus.INTERNAL_SERVER_ERROR
+        await _send_json(writer, status, record)
+
+
+def _head(status: HTTPStatus, content_type: str, length: Optional[int] = None) -> bytes:
+    """Response head; without a length the body runs until the connection closes"""
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}",
+             "Connection: close"]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: HTTPStatus, body: Dict):
+    data = json.dumps(body, default=_json_default).encode()
+    writer.write(_head(status, "application/json", len(data)) + data)
+    await writer.drain()
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **options):
+    """Run a PredictionService until interrupted (options as PredictionService)"""
+    async def main():
+        service = PredictionService(**options)
+        start = perf_counter()
+        await service.start(host, port)
+        print(f"Warm in {perf_counter() - start:.2f}s - {service.workers} workers, seed {service.seed}")
+        print(f"Serving on http://{host}:{service.port}", flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
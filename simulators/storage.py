@@ -0,0 +1,197 @@
+"""
+Columnar storage for simulation runs
+
+Runs are written column by column with compact encodings instead of one CSV
+row per race: string columns (winner, team, manufacturer, tier) become
+dictionary-encoded integer codes, booleans become uint8, and integer counts
+are downcast to the smallest dtype that holds them. Run metadata (track,
+model version, engine, seed, n, timestamp) travels with the data.
+
+The format follows the file extension:
+- .npz      numpy archive, always available (the default)
+- .parquet  / .feather  via pyarrow, if installed
+
+npz archives are stored uncompressed unless asked: the encoded columns are
+already ~1 byte per race, and zlib inflate would dominate the load time.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RESULTS_DIR_ENV = "NASCAR_MC_RESULTS_DIR"
+DEFAULT_RESULTS_DIR = "data"
+CACHE_DIR_ENV = "NASCAR_MC_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "nascar-mc")
+
+_SCHEMA_KEY = "__schema__"
+_METADATA_KEY = "__metadata__"
+
+
+def results_dir(output_dir: Optional[str] = None) -> str:
+    """Output directory: explicit argument, then $NASCAR_MC_RESULTS_DIR, then ./data"""
+    return output_dir or os.environ.get(RESULTS_DIR_ENV, DEFAULT_RESULTS_DIR)
+
+
+def cache_dir(path: Optional[str] = None) -> str:
+    """Cache directory: explicit argument, then $NASCAR_MC_CACHE_DIR, then ~/.cache/nascar-mc"""
+    return os.path.expanduser(path or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+
+
+def run_metadata(track: str, model_version: str, n_simulations: int, engine: str = None,
+                 seed: Optional[int] = None, **extra) -> Dict:
+    """Standard metadata block stored with every run"""
+    return {
+        'track': track,
+        'model_version': model_version,
+        'engine': engine,
+        'seed': seed,
+        'n_simulations': n_simulations,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **extra,
+    }
+
+
+def _encode_npz(df: pd.DataFrame) -> Tuple[Dict[str, np.ndarray], list]:
+    import pandas as pd
+    arrays, schema = {}, []
+    for name in df.columns:
+        col = df[name]
+        if isinstance(col.dtype, pd.CategoricalDtype) or col.dtype == object or pd.api.types.is_string_dtype(col):
+            cat = pd.Categorical(col)
+            codes = cat.codes
+            arrays[name] = codes.astype(np.int8 if len(cat.categories) < 127 else np.int32)
+            arrays[f"{name}.categories"] = np.asarray(cat.categories, dtype=str)
+            schema.append({'name': name, 'kind': 'category', 'dtype': str(col.dtype)})
+        elif col.dtype == bool:
+            arrays[name] = col.to_numpy().astype(np.uint8)
+            schema.append({'name': name, 'kind': 'bool', 'dtype': str(col.dtype)})
+        elif pd.api.types.is_integer_dtype(col):
+            arrays[name] = pd.to_numeric(col, downcast="integer").to_numpy()
+            schema.append({'name': name, 'kind': 'int', 'dtype': str(col.dtype)})
+        else:
+            values = col.to_numpy(dtype=float)
+            levels, codes = np.unique(values, return_inverse=True)
+            if len(levels) <= 255:
+                # Rates and laps take a handful of values - dictionary-encode them too
+                arrays[name] = codes.astype(np.uint8)
+                arrays[f"{name}.levels"] = levels
+                schema.append({'name': name, 'kind': 'float_levels', 'dtype': str(col.dtype)})
+            else:
+                arrays[name] = values
+                schema.append({'name': name, 'kind': 'float', 'dtype': str(col.dtype)})
+    return arrays, schema
+
+
+def _decode_npz(data, schema: list, restore_dtypes: bool = False) -> pd.DataFrame:
+    import pandas as pd
+    columns = {}
+    for field in schema:
+        name, kind = field['name'], field['kind']
+        values = data[name]
+        if kind == 'category':
+            columns[name] = pd.Categorical.from_codes(values, data[f"{name}.categories"], validate=False)
+        elif kind == 'bool':
+            columns[name] = values.view(bool)
+        elif kind == 'float_levels':
+            columns[name] = data[f"{name}.levels"].astype(field['dtype'])[values]
+        else:
+            # Counts keep their compact dtype - the values are exact either way
+            columns[name] = values
+        if restore_dtypes and 'dtype' in field:
+            columns[name] = pd.Series(columns[name], copy=False).astype(field['dtype'])
+    return pd.DataFrame(columns, copy=False)
+
+
+def frame_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """A results frame as the named arrays of an npz archive, schema included"""
+    arrays, schema = _encode_npz(df)
+    arrays[_SCHEMA_KEY] = np.array(json.dumps(schema))
+    return arrays
+
+
+def frame_from_arrays(data, restore_dtypes: bool = False) -> pd.DataFrame:
+    """Inverse of frame_arrays - data is any mapping of its arrays (e.g. an open npz)
+
+    Strings come back categorical and counts compact, as from load_results;
+    restore_dtypes=True casts every column back to the dtype it was written with.
+    """
+    return _decode_npz(data, json.loads(str(data[_SCHEMA_KEY])), restore_dtypes)
+
+
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Categorical string columns so Arrow dictionary-encodes them"""
+    import pandas as pd
+    out = df.copy()
+    for name in out.columns:
+        if out[name].dtype == object or pd.api.types.is_string_dtype(out[name]):
+            out[name] = out[name].astype("category")
+    return out
+
+
+def save_results(df: pd.DataFrame, path: str, metadata: Optional[Dict] = None,
+                 compress: Optional[bool] = None) -> str:
+    """Write a per-race results frame plus run metadata; returns the path written
+
+    compress=None uses the format default: zstd for Parquet/Feather, none for npz.
+    """
+    metadata = metadata or {}
+    ext = os.path.splitext(path)[1].lower()
+    if compress is None:
+        compress = ext != ".npz"
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    if ext == ".npz":
+        arrays = frame_arrays(df)
+        arrays[_METADATA_KEY] = np.array(json.dumps(metadata))
+        (np.savez_compressed if compress else np.savez)(path, **arrays)
+    elif ext in (".parquet", ".feather"):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(_categorize(df), preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _METADATA_KEY.encode(): json.dumps(metadata).encode(),
+        })
+        if ext == ".parquet":
+            pq.write_table(table, path, compression="zstd" if compress else None)
+        else:
+            feather.write_feather(table, path, compression="zstd" if compress else "uncompressed")
+    else:
+        raise ValueError(f"Unsupported results format: {ext!r} (use .npz, .parquet or .feather)")
+
+    return path
+
+
+def load_results(path: str) -> Tuple[pd.DataFrame, Dict]:
+    """Read a run written by save_results -> (results frame, metadata)
+
+    String columns come back as pandas Categoricals.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".npz":
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data[_METADATA_KEY]))
+            return frame_from_arrays(data), metadata
+
+    if ext in (".parquet", ".feather"):
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path) if ext == ".parquet" else feather.read_table(path)
+        raw = (table.schema.metadata or {}).get(_METADATA_KEY.encode(), b"{}")
+        return table.to_pandas(), json.loads(raw)
+
+    raise ValueError(f"Unsupported results format: {ext!r} (use .npz, .parquet or .feather)")
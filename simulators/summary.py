@@ -0,0 +1,183 @@
+"""
+Run summaries and their console rendering
+
+summarize() condenses a RaceAccumulator into a RaceSummary: the win table
+with 95% intervals, a track's chaos statistics and scenario breakdowns,
+manufacturer wins and (when simulated) finishing positions. It is plain
+data - to_dict() is JSON-ready for a scheduler or service - and
+print_summary() is the console renderer the analyze_*_results functions use.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from simulators.accumulator import RaceAccumulator
+from simulators.convergence import Z_95, wilson_interval
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class Stat:
+    """One summary statistic; fmt renders its value (e.g. "{:.1%} DNF")"""
+    label: str
+    value: float
+    fmt: str = "{:.1%}"
+
+
+@dataclass(frozen=True, eq=False)
+class Scenario:
+    """Win shares among the races where a condition held (or did not)"""
+    label: str
+    races: int
+    leaders: pd.Series
+
+
+def scenario(acc: RaceAccumulator, label: str, condition: str, value: bool = True,
+             top_n: int = 5) -> Scenario:
+    """The top_n drivers' win share in the races where condition == value"""
+    import pandas as pd
+    races = acc.races(condition, value)
+    if races == 0:
+        return Scenario(label, 0, pd.Series(dtype=float, name='share'))
+    wins = acc.win_counts(condition=condition, value=value).head(top_n)
+    return Scenario(label, races, (wins / races).rename('share'))
+
+
+@dataclass
+class RaceSummary:
+    """Everything a results report shows, as data
+
+    wins holds the top drivers' wins (expected wins when rao_blackwell),
+    probability and 95% interval; manufacturers their wins and share;
+    finishing the finish_table() of a finishing-order run, else None.
+    """
+    title: str
+    n_races: int
+    rao_blackwell: bool
+    wins: pd.DataFrame
+    manufacturers: pd.DataFrame
+    stats_title: str = ""
+    stats: List[Stat] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    scenarios: List[Scenario] = field(default_factory=list)
+    finishing: Optional[pd.DataFrame] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'title': self.title,
+            'n_races': self.n_races,
+            'rao_blackwell': self.rao_blackwell,
+            'wins': self.wins.reset_index().to_dict('records'),
+            'stats': {s.label: s.value for s in self.stats},
+            'scenarios': [{'label': s.label, 'races': s.races, 'leaders': s.leaders.to_dict()}
+                          for s in self.scenarios],
+            'manufacturers': self.manufacturers.reset_index().to_dict('records'),
+            'finishing': None if self.finishing is None else self.finishing.reset_index().to_dict('records'),
+        }
+
+
+def win_table(acc: RaceAccumulator, top_n: int = 15) -> pd.DataFrame:
+    """Top drivers' wins, win probability and 95% interval
+
+    Wilson intervals on sampled wins; for a Rao-Blackwellized accumulator,
+    expected wins with normal intervals from the per-race probabilities.
+    """
+    import pandas as pd
+    total_sims = acc.races()
+    top = acc.win_counts().head(top_n)
+    p = top.to_numpy() / max(total_sims, 1)
+    if acc.rao_blackwell:
+        half = Z_95 * acc.win_probability_se()[top.index].to_numpy()
+        ci_low, ci_high = p - half, p + half
+    else:
+        ci_low, ci_high = wilson_interval(top.to_numpy(), total_sims)
+    return pd.DataFrame({'wins': top.to_numpy(), 'probability': p, 'ci_low': ci_low, 'ci_high': ci_high},
+                        index=pd.Index(top.index, name='driver'))
+
+
+def summarize(acc: RaceAccumulator, title: str, stats_title: str = "",
+              stats: Sequence[Stat] = (), notes: Sequence[str] = (),
+              scenarios: Sequence[Scenario] = (), top_n: int = 15) -> RaceSummary:
+    """A RaceSummary of acc with a track's own statistics and scenarios"""
+    import pandas as pd
+    manufacturers = acc.win_counts(by='manufacturer')
+    return RaceSummary(
+        title=title,
+        n_races=acc.races(),
+        rao_blackwell=acc.rao_blackwell,
+        wins=win_table(acc, top_n),
+        manufacturers=pd.DataFrame({'wins': manufacturers,
+                                    'share': manufacturers / max(acc.races(), 1)}),
+        stats_title=stats_title,
+        stats=list(stats),
+        notes=list(notes),
+        scenarios=list(scenarios),
+        finishing=acc.finish_table().head(top_n) if acc.finishing_order else None,
+    )
+
+
+def print_heading(title: str, file=None):
+    print(f"\n{'='*70}", file=file)
+    print(title, file=file)
+    print(f"{'='*70}", file=file)
+
+
+def print_win_probabilities(summary: RaceSummary, name_width: int = 25, file=None):
+    """Win counts and percentages with 95% intervals"""
+    if summary.rao_blackwell:
+        header = "Exp wins", "95% CI (R-B)"
+    else:
+        header = "Wins", "95% CI (Wilson)"
+
+    print(f"WIN PROBABILITIES (Top {len(summary.wins)}):", file=file)
+    print(f"{'Driver':<{name_width}} {header[0]:>8} {'Win %':>8} {header[1]:>19}", file=file)
+    print("-" * 70, file=file)
+    for driver, row in summary.wins.iterrows():
+        print(f"{driver:<{name_width}} {row['wins']:>8,.0f} {row['probability'] * 100:>7.2f}% "
+              f"{row['ci_low'] * 100:>8.2f}% -{row['ci_high'] * 100:>6.2f}%", file=file)
+
+
+def print_manufacturers(summary: RaceSummary, file=None):
+    print_heading("MANUFACTURER PERFORMANCE", file)
+    for mfg, row in summary.manufacturers.iterrows():
+        print(f"{mfg}: {row['wins']:,.0f} wins ({row['share']:.1%})", file=file)
+
+
+def print_finishing_positions(summary: RaceSummary, name_width: int = 25, file=None):
+    """Top-5 / top-10 probabilities and average finish, best average first"""
+    print_heading("FINISHING POSITIONS", file)
+    print(f"{'Driver':<{name_width}} {'Win %':>8} {'Top 5 %':>8} {'Top 10 %':>9} {'Avg finish':>11}",
+          file=file)
+    print("-" * 70, file=file)
+    for driver, row in summary.finishing.iterrows():
+        print(f"{driver:<{name_width}} {row['win']:>7.2%} {row['top5']:>8.2%} "
+              f"{row['top10']:>8.2%} {row['avg_finish']:>11.2f}", file=file)
+
+
+def print_summary(summary: RaceSummary, name_width: int = 25, file=None):
+    """Render a RaceSummary as the console report (to file, default stdout)"""
+    print_heading(summary.title, file)
+    print(file=file)
+    print_win_probabilities(summary, name_width, file)
+
+    if summary.stats_title:
+        print_heading(summary.stats_title, file)
+    for stat in summary.stats:
+        print(f"{stat.label}: {stat.fmt.format(stat.value)}", file=file)
+    for note in summary.notes:
+        print(f"\n{note}", file=file)
+
+    if summary.scenarios:
+        print_heading("SCENARIO BREAKDOWN", file)
+    for s in summary.scenarios:
+        print(f"\n{s.label} ({s.races:,} / {summary.n_races:,}):", file=file)
+        for driver, share in s.leaders.items():
+            print(f"  {driver}: {share:.1%}", file=file)
+
+    print_manufacturers(summary, file)
+    if summary.finishing is not None:
+        print_finishing_positions(summary, name_width, file)
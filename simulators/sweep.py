@@ -0,0 +1,181 @@
+"""
+Parameter sweeps with common random numbers
+
+Runs many variants of a TrackModel - attribute weights, streak multipliers,
+crash probabilities - on the same simulated races. Every configuration
+sees the same chaos random stream and the same winner-draw uniforms, so the
+difference between two configurations is measured race for race instead
+of between independent runs, and its variance is a fraction of theirs.
+Configurations that only change how the field is scored share one chaos
+simulation; the chaos phase is rerun only for each distinct set of chaos
+events.
+
+    from simulators.sweep import grid, run_sweep, with_weights
+    from simulators.atlanta_recalibrated import ATLANTA_MODEL, ATLANTA_DRIVERS
+
+    sweep = run_sweep(lambda clutch: with_weights(ATLANTA_MODEL, clutch_factor=clutch),
+                      grid(clutch=[0.18, 0.20, 0.22, 0.25]), ATLANTA_DRIVERS,
+                      n_simulations=100_000, seed=42)
+    sweep.differences()       # win-probability change vs the first configuration
+    sweep.standard_errors()   # and its paired standard error
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import replace
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from simulators.engine import BatchSimulator
+from simulators.progress import ProgressCallback, ProgressTracker, console_progress
+from simulators.rng import root_seed_sequence
+from simulators.roster import Roster
+from simulators.track_model import TrackModel
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def grid(**axes: Sequence) -> List[Dict]:
+    """Every combination of the axes' values, as keyword-argument dicts"""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def random_grid(n: int, seed: Optional[int] = None, **axes) -> List[Dict]:
+    """n random configurations: a (low, high) tuple axis is drawn uniformly,
+    a list axis picks one of its values"""
+    rng = np.random.default_rng(seed)
+    configs = [{} for _ in range(n)]
+    for name, axis in axes.items():
+        if isinstance(axis, tuple):
+            values = rng.uniform(axis[0], axis[1], size=n).tolist()
+        else:
+            values = [axis[k] for k in rng.integers(len(axis), size=n)]
+        for config, value in zip(configs, values):
+            config[name] = value
+    return configs
+
+
+def with_weights(model: TrackModel, **weights: float) -> TrackModel:
+    """model with some win-score attribute weights changed (or added)"""
+    return replace(model, win=replace(model.win, weights={**model.win.weights, **weights}))
+
+
+def with_chaos(model: TrackModel, event: str, **fields) -> TrackModel:
+    """model with fields of one chaos event changed, e.g. prob=0.02"""
+    names = [e.name for e in model.chaos]
+    if event not in names:
+        raise ValueError(f"Unknown chaos event: {event!r} (expected one of {', '.join(names)})")
+    chaos = tuple(replace(e, **fields) if e.name == event else e for e in model.chaos)
+    return replace(model, chaos=chaos)
+
+
+class SweepResult:
+    """Win counts per configuration, plus the race-by-race agreement with
+    the reference configuration needed for paired standard errors"""
+
+    def __init__(self, configs: List[Dict], names: Sequence[str], counts: np.ndarray,
+                 agree: np.ndarray, n_simulations: int, reference: int):
+        self.configs = configs
+        self.names = list(names)
+        self.counts = counts
+        self.agree = agree
+        self.n_simulations = n_simulations
+        self.reference = reference
+
+    def params(self) -> pd.DataFrame:
+        import pandas as pd
+        return pd.DataFrame(self.configs, index=pd.RangeIndex(len(self.configs), name='config'))
+
+    def win_probabilities(self) -> pd.DataFrame:
+        """Win probability per (configuration, driver)"""
+        import pandas as pd
+        return pd.DataFrame(self.counts / self.n_simulations, columns=self.names,
+                            index=pd.RangeIndex(len(self.configs), name='config'))
+
+    def differences(self) -> pd.DataFrame:
+        """Win-probability change vs the reference configuration"""
+        probs = self.win_probabilities()
+        return probs - probs.iloc[self.reference]
+
+    def standard_errors(self) -> pd.DataFrame:
+        """Standard error of differences() - paired over the shared races"""
+        import pandas as pd
+        n = self.n_simulations
+        p = self.counts / n
+        p_ref = p[self.reference]
+        # Per race the difference is 1[config picked i] - 1[reference picked i]
+        mean_sq = p + p_ref - 2 * self.agree / n
+        var = np.maximum(mean_sq - (p - p_ref) ** 2, 0.0)
+        return pd.DataFrame(np.sqrt(var / n), columns=self.names,
+                            index=pd.RangeIndex(len(self.configs), name='config'))
+
+    def summary(self, top_n: int = 3) -> pd.DataFrame:
+        """Each configuration's parameters and its top_n drivers' win %"""
+        rows = []
+        for probs in self.win_probabilities().to_numpy():
+            top = np.argsort(-probs, kind="stable")[:top_n]
+            rows.append(", ".join(f"{self.names[i]} {probs[i]:.1%}" for i in top))
+        table = self.params()
+        table['leaders'] = rows
+        return table
+
+
+def run_sweep(build: Callable[..., TrackModel], configs: List[Dict], drivers: Sequence,
+              n_simulations: int = 10000, seed: Optional[int] = None,
+              rng: Optional[np.random.Generator] = None, batch_size: int = 50000,
+              reference: int = 0, verbose: bool = False,
+              progress: Optional[ProgressCallback] = None) -> SweepResult:
+    """Win distributions of build(**config) for every config, on common random numbers
+
+    Runs with the vectorized engine in batches of batch_size. Each distinct
+    chaos setup is simulated once per batch from its own copy of one chaos
+    stream; every configuration then draws its winners with the same
+    uniforms. reference is the configuration differences are taken against.
+
+    progress receives a Progress record after every batch (the leader is
+    the reference configuration's); verbose=True prints them.
+    """
+    if not configs:
+        raise ValueError("run_sweep needs at least one configuration")
+    roster = Roster(drivers)
+    models = [build(**config) for config in configs]
+
+    chaos_seq, win_seq = root_seed_sequence(seed, rng).spawn(2)
+    win_rng = np.random.default_rng(win_seq)
+
+    # Configurations grouped by chaos setup; each group replays the chaos stream
+    groups: Dict[str, List[int]] = {}
+    for c, model in enumerate(models):
+        groups.setdefault(model.chaos_signature(), []).append(c)
+    chaos_sims = {key: BatchSimulator(models[members[0]], roster, np.random.default_rng(chaos_seq))
+                  for key, members in groups.items()}
+    win_sims = [BatchSimulator(model, roster) for model in models]
+
+    progress = progress or (console_progress if verbose else None)
+    tracker = ProgressTracker(progress, n_simulations, every=1) if progress else None
+
+    counts = np.zeros((len(models), len(roster)), dtype=np.int64)
+    agree = np.zeros((len(models), len(roster)), dtype=np.int64)
+    done = 0
+    while done < n_simulations:
+        size = min(batch_size, n_simulations - done)
+        u = win_rng.random((size, 1))
+        winners = np.empty((len(models), size), dtype=np.int64)
+        for key, members in groups.items():
+            running, incidents, _, chaos = chaos_sims[key].simulate_field(size)
+            for c in members:
+                winners[c] = win_sims[c].determine_winner(running, incidents, chaos, u)
+
+        for c in range(len(models)):
+            counts[c] += np.bincount(winners[c], minlength=len(roster))
+            same = winners[c] == winners[reference]
+            agree[c] += np.bincount(winners[c][same], minlength=len(roster))
+        done += size
+        if tracker:
+            tracker.update(size, roster.names[winners[reference]])
+
+    return SweepResult(configs, roster.names, counts, agree, n_simulations, reference)
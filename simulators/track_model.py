@@ -0,0 +1,185 @@
+"""
+Track models declared as data
+
+Everything that makes one race different from another lives in a
+TrackModel: the distance and fixed cautions, how a winner is scored
+(attribute weights, multiplier rules, scenario boosts, damage) and the chaos
+events that can happen (lap windows, per-lap probabilities, how many cars
+they collect and who). The shared engine in simulators.engine runs any
+model, so a new track is a new TrackModel rather than a new simulator.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+TRACK_TYPES = ("superspeedway", "intermediate", "road", "flat")
+
+# Driver labels a Multiplier can match on (Roster attribute names)
+LABELS = ("names", "teams", "manufacturers", "tiers")
+
+
+@dataclass(frozen=True, eq=False)
+class Factor:
+    """offset + sum(weight * attribute), at least floor, optionally inverted
+
+    One factor of a per-driver quantity: Factor({"aggression": 1 / 50})
+    is aggression / 50, Factor({"chaos_survival": 1.0}, offset=1.0,
+    reciprocal=True) is 1 / (chaos_survival + 1).
+    """
+    weights: Dict[str, float]
+    offset: float = 0.0
+    floor: Optional[float] = None
+    reciprocal: bool = False
+
+    def evaluate(self, roster) -> np.ndarray:
+        value = np.full(len(roster), self.offset)
+        for attribute, weight in self.weights.items():
+            value = value + getattr(roster, attribute) * weight
+        if self.floor is not None:
+            value = np.maximum(self.floor, value)
+        return 1.0 / value if self.reciprocal else value
+
+
+def evaluate_factors(factors: Sequence[Factor], roster) -> np.ndarray:
+    """Product of factors per driver (all ones for an empty sequence)"""
+    value = np.ones(len(roster))
+    for f in factors:
+        value = value * f.evaluate(roster)
+    return value
+
+
+@dataclass(frozen=True, eq=False)
+class Multiplier:
+    """Win-score factor for the drivers a rule selects
+
+    field is either a label (see LABELS) and the driver qualifies if it is
+    one of values, or a numeric attribute and the driver qualifies if
+    low <= attribute <= high.
+    """
+    field: str
+    factor: float
+    values: Tuple[str, ...] = ()
+    low: float = -np.inf
+    high: float = np.inf
+
+    def mask(self, roster) -> np.ndarray:
+        if self.field in LABELS:
+            return roster.matches(self.field, self.values)
+        value = getattr(roster, self.field)
+        return (value >= self.low) & (value <= self.high)
+
+
+@dataclass(frozen=True, eq=False)
+class WinModel:
+    """How the surviving field is scored for the winner draw
+
+    score = sum(weight * attribute) * product of matching multipliers, then
+    per race: times the boost of every scenario (a flagged chaos event, by
+    name) that happened, times (1 - damage * incidents), at least floor.
+    Running drivers win in proportion to their score.
+    """
+    weights: Dict[str, float]
+    multipliers: Tuple[Multiplier, ...] = ()
+    scenarios: Dict[str, Tuple[Factor, ...]] = field(default_factory=dict)
+    damage: float = 0.0
+    floor: Optional[float] = None
+
+
+@dataclass(frozen=True, eq=False)
+class ChaosEvent:
+    """One kind of caution: when it can happen, how often and who it collects
+
+    laps is the inclusive (first, last) window - last=None runs to the
+    scheduled distance. prob is the per-lap probability, or one per lap of
+    the window. A once event stops after its first hit (a Big One, a Turn 1
+    pileup); otherwise it can happen on every lap of the window.
+
+    size is the inclusive (min, max) number of cars collected, drawn
+    without replacement in proportion to the product of weights; (0, 0) is a
+    caution that collects nobody. A collected car is out with probability
+    terminal, else damaged (one more incident). If the field is smaller than
+    the crash, all but spare cars are collected. An event that would
+    collect cars from an empty field does not happen.
+
+    flag=True adds a boolean result column named after the event (and makes
+    it usable as a WinModel scenario); record_lap also adds '<name>_lap'.
+    """
+    name: str
+    laps: Tuple[int, Optional[int]]
+    prob: Union[float, Tuple[float, ...]]
+    once: bool = False
+    size: Tuple[int, int] = (0, 0)
+    weights: Tuple[Factor, ...] = ()
+    terminal: float = 1.0
+    spare: int = 0
+    flag: bool = False
+    record_lap: bool = False
+
+    def window(self, total_laps: int) -> Tuple[int, int]:
+        first, last = self.laps
+        return first, total_laps if last is None else min(last, total_laps)
+
+    def lap_probs(self, total_laps: int) -> np.ndarray:
+        """Per-lap probability over the window"""
+        first, last = self.window(total_laps)
+        return np.broadcast_to(np.asarray(self.prob, dtype=float), (max(last - first + 1, 0),))
+
+    @property
+    def constant(self) -> bool:
+        return np.ndim(self.prob) == 0
+
+    @property
+    def collects(self) -> bool:
+        return self.size[1] > 0
+
+
+@dataclass(frozen=True, eq=False)
+class TrackModel:
+    """A race: distance, fixed cautions, win scoring and chaos events
+
+    chaos events are rolled in declaration order within a lap; stage_breaks
+    are cautions on fixed laps.
+    """
+    name: str
+    track_type: str
+    version: str
+    total_laps: int
+    win: WinModel
+    chaos: Tuple[ChaosEvent, ...] = ()
+    stage_breaks: Tuple[int, ...] = ()
+
+    def __post_init__(self):
+        if self.track_type not in TRACK_TYPES:
+            raise ValueError(f"Unknown track type: {self.track_type!r} (expected one of {TRACK_TYPES})")
+        names = [e.name for e in self.chaos]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Chaos event names must be unique: {names}")
+        for event in self.chaos:
+            first, last = event.window(self.total_laps)
+            if not event.constant and len(event.prob) != last - first + 1:
+                raise ValueError(f"{event.name}: one probability per lap of the window expected")
+            if event.record_lap and not (event.flag and event.once):
+                raise ValueError(f"{event.name}: record_lap needs a flagged once event")
+        for scenario in self.win.scenarios:
+            if scenario not in self.conditions:
+                raise ValueError(f"Scenario {scenario!r} is not a flagged chaos event")
+
+    @property
+    def conditions(self) -> Tuple[str, ...]:
+        """Boolean result columns - the flagged chaos events"""
+        return tuple(e.name for e in self.chaos if e.flag)
+
+    @property
+    def lap_columns(self) -> Tuple[str, ...]:
+        return tuple(f"{e.name}_lap" for e in self.chaos if e.record_lap)
+
+    @property
+    def chaos_attributes(self) -> frozenset:
+        """Driver attributes the chaos events read - who gets collected"""
+        return frozenset(a for e in self.chaos for f in e.weights for a in f.weights)
+
+    def chaos_signature(self) -> str:
+        """Everything that shapes the chaos phase - equal signatures give the same field"""
+        return repr((self.total_laps, self.stage_breaks, self.chaos))
@@ -0,0 +1,29 @@
+"""
+Track registry
+
+Maps a track name to the module that declares its TrackModel and roster, so
+tools can run any track by name through simulators.engine. Adding a track is
+one module plus one entry here; for python -m simulators the module also
+defines run_<name>_monte_carlo, analyze_<name>_results and RESULTS_FILE.
+"""
+
+import importlib
+from typing import List, Tuple
+
+from simulators.track_model import TrackModel
+
+# name -> (module, model attribute, roster attribute)
+TRACKS = {
+    "atlanta": ("simulators.atlanta_recalibrated", "ATLANTA_MODEL", "ATLANTA_DRIVERS"),
+    "cota": ("simulators.cota_simulator", "COTA_MODEL", "COTA_DRIVERS"),
+    "phoenix": ("simulators.phoenix.phoenix_v25_simulator", "PHOENIX_MODEL", "PHOENIX_DRIVERS"),
+}
+
+
+def load_track(name: str) -> Tuple[TrackModel, List]:
+    """(model, drivers) for a registered track - the module is imported on first use"""
+    if name not in TRACKS:
+        raise ValueError(f"Unknown track: {name!r} (expected one of {', '.join(TRACKS)})")
+    module_name, model, drivers = TRACKS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, model), getattr(module, drivers)
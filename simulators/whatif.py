@@ -0,0 +1,126 @@
+"""
+Incremental "what-if" re-simulation
+
+Race week edits one driver at a time (a practice-session recent_form bump,
+a new aggression estimate) and asks how the picture changes. A WhatIfRun
+simulates its races once and keeps each race's end state - who is still
+running, each car's damage, the flagged events - plus the uniform that
+decided its winner. An edit that only touches scoring attributes then just
+redraws the winners over the cached fields; only an edit to an attribute
+the chaos events read (aggression, chaos_survival, recovery, ...) reruns
+the chaos phase, replaying the same random stream.
+
+Either way the edited run shares its random numbers with the previous one,
+so the change in win probability is the edit's effect rather than noise.
+
+    run = WhatIfRun(ATLANTA_MODEL, ATLANTA_DRIVERS, n_simulations=10_000, seed=42)
+    before = run.win_probabilities()
+    run.update("Chase Elliott", recent_form=9.0)    # rescoring only
+    run.win_probabilities() - before
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+
+from simulators.engine import BatchSimulator, batch_results
+from simulators.rng import root_seed_sequence
+from simulators.roster import Roster
+from simulators.track_model import TrackModel
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class WhatIfRun:
+    """A fixed set of races, rescored or re-run after driver and model edits
+
+    rerun says what the last change cost: "chaos" (the chaos phase was
+    simulated again) or "winner" (only the winner draw).
+    """
+
+    def __init__(self, model: TrackModel, drivers: Sequence, n_simulations: int = 10000,
+                 seed: Optional[int] = None, rng: Optional[np.random.Generator] = None,
+                 batch_size: int = 50000):
+        self.model = model
+        self.drivers = list(drivers)
+        self.roster = Roster(self.drivers)
+        self.n_simulations = n_simulations
+        self.batch_size = batch_size
+
+        self._chaos_seq, win_seq = root_seed_sequence(seed, rng).spawn(2)
+        self.u = np.random.default_rng(win_seq).random((n_simulations, 1))
+        self._simulate_field()
+        self._draw_winners()
+
+    def _batches(self):
+        for start in range(0, self.n_simulations, self.batch_size):
+            yield slice(start, min(start + self.batch_size, self.n_simulations))
+
+    def _simulate_field(self):
+        """Chaos phase for every race, from the start of the chaos stream"""
+        sim = BatchSimulator(self.model, self.roster, np.random.default_rng(self._chaos_seq))
+        parts = [sim.simulate_field(rows.stop - rows.start) for rows in self._batches()]
+        running, incidents, cautions, chaos = zip(*parts)
+        self.running = np.concatenate(running)
+        self.incidents = None if incidents[0] is None else np.concatenate(incidents)
+        self.cautions = np.concatenate(cautions)
+        self.chaos = {column: np.concatenate([c[column] for c in chaos]) for column in chaos[0]}
+        self.rerun = "chaos"
+
+    def _draw_winners(self):
+        """Winner of every cached race, with its cached uniform"""
+        sim = BatchSimulator(self.model, self.roster)
+        self.winners = np.empty(self.n_simulations, dtype=np.int64)
+        for rows in self._batches():
+            incidents = None if self.incidents is None else self.incidents[rows]
+            chaos = {column: values[rows] for column, values in self.chaos.items()}
+            self.winners[rows] = sim.determine_winner(self.running[rows], incidents, chaos, self.u[rows])
+
+    def update(self, name: str, **changes) -> pd.DataFrame:
+        """Edit one driver's attributes and return the updated results
+
+        Reruns the chaos phase only if a changed attribute is one the
+        model's chaos events read.
+        """
+        index = {d.name: i for i, d in enumerate(self.drivers)}
+        if name not in index:
+            raise ValueError(f"Unknown driver: {name!r}")
+        self.drivers[index[name]] = replace(self.drivers[index[name]], **changes)
+        self.roster = Roster(self.drivers)
+
+        if self.model.chaos_attributes & set(changes):
+            self._simulate_field()
+        else:
+            self.rerun = "winner"
+        self._draw_winners()
+        return self.results()
+
+    def set_model(self, model: TrackModel) -> pd.DataFrame:
+        """Swap in an edited model (e.g. new weights) and return the updated results
+
+        Reruns the chaos phase only if the chaos events changed.
+        """
+        chaos_changed = model.chaos_signature() != self.model.chaos_signature()
+        self.model = model
+        if chaos_changed:
+            self._simulate_field()
+        else:
+            self.rerun = "winner"
+        self._draw_winners()
+        return self.results()
+
+    def results(self) -> pd.DataFrame:
+        """One row per race, as a vectorized run returns them"""
+        import pandas as pd
+        return pd.DataFrame(batch_results(self.model, self.roster, self.winners, self.chaos,
+                                          self.cautions, self.running.sum(axis=1)))
+
+    def win_probabilities(self) -> pd.Series:
+        """Win share per driver over the cached races"""
+        import pandas as pd
+        counts = np.bincount(self.winners, minlength=len(self.roster))
+        return pd.Series(counts / self.n_simulations, index=pd.Index(self.roster.names, name='winner'))
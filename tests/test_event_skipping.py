@@ -0,0 +1,116 @@
+"""
+engine="events" and engine="vectorized" against the lap loop
+
+Event skipping draws the next incident's lap from a geometric distribution
+instead of rolling every lap, and the vectorized engine runs a whole batch
+of races per lap on arrays, so their races differ from engine="scalar"'s
+race by race but must follow the same distributions. Each test compares
+seeded runs against the scalar engine with a two-sample chi-square test,
+and the means of the race totals with a two-sample z-test.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from simulators.atlanta_recalibrated import run_atlanta_monte_carlo
+from simulators.cota_simulator import run_cota_monte_carlo
+
+N_RACES = 8000
+
+# A seeded run either always passes or always fails; this only guards
+# against a real difference, not against sampling noise
+MIN_P_VALUE = 1e-3
+MAX_Z = 4.0
+
+ENGINES = ["events", "vectorized"]
+
+# Per track: the run, the columns whose distributions must match and the
+# columns whose means must (a flag's mean is its rate)
+RUNS = {
+    "atlanta": (run_atlanta_monte_carlo,
+                ["winner", "total_cautions", "running_at_finish", "green_white_checkered",
+                 "early_carnage", "early_carnage_lap"],
+                ["total_cautions", "running_at_finish", "green_white_checkered"]),
+    "cota": (run_cota_monte_carlo,
+             ["winner", "total_cautions", "running_at_finish", "turn_1_carnage"],
+             ["total_cautions", "running_at_finish"]),
+}
+
+
+def chi2_sf(x: float, df: int) -> float:
+    """Chi-square upper tail P(X > x), Wilson-Hilferty approximation"""
+    if df <= 0:
+        return 1.0
+    z = ((x / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def two_sample_p_value(a, b, min_expected: float = 5.0) -> float:
+    """p-value that a and b come from the same discrete distribution
+
+    Values expected fewer than min_expected times in either sample are
+    pooled into one bin.
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    values = np.unique(np.concatenate([a, b]))
+    counts = np.array([[np.sum(a == v) for v in values], [np.sum(b == v) for v in values]], dtype=float)
+
+    share = np.array([a.size, b.size])[:, None] / (a.size + b.size)
+    small = (counts.sum(axis=0) * share.min() < min_expected)
+    if small.any():
+        counts = np.column_stack([counts[:, ~small], counts[:, small].sum(axis=1)])
+    expected = counts.sum(axis=0) * share
+
+    keep = expected.min(axis=0) > 0
+    stat = float((((counts - expected) ** 2)[:, keep] / expected[:, keep]).sum())
+    return chi2_sf(stat, int(keep.sum()) - 1)
+
+
+def z_score(a, b) -> float:
+    """Difference of the means of a and b in standard errors"""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    return float((a.mean() - b.mean()) / math.sqrt(a.var() / a.size + b.var() / b.size))
+
+
+@lru_cache(maxsize=None)
+def seeded_run(track: str, engine: str, seed: int):
+    return RUNS[track][0](N_RACES, engine=engine, seed=seed, quiet=True)
+
+
+@pytest.fixture(scope="module", params=[(track, engine) for track in sorted(RUNS) for engine in ENGINES],
+                ids="-".join)
+def runs(request):
+    track, engine = request.param
+    return track, engine, seeded_run(track, "scalar", 2024), seeded_run(track, engine, 7)
+
+
+def test_engine_matches_lap_loop(runs):
+    track, engine, scalar, other = runs
+    for column in RUNS[track][1]:
+        p = two_sample_p_value(scalar[column].dropna(), other[column].dropna())
+        assert p > MIN_P_VALUE, f"{track} {engine} {column}: p = {p:.2g}"
+
+
+def test_engine_matches_lap_loop_means(runs):
+    track, engine, scalar, other = runs
+    for column in RUNS[track][2]:
+        z = z_score(other[column], scalar[column])
+        assert abs(z) < MAX_Z, (f"{track} {engine} {column}: {other[column].mean():.3f} "
+                                f"vs scalar {scalar[column].mean():.3f}")
+
+
+def test_chi2_sf():
+    # Table values: P(X > 3.841 | df=1) = 0.05, P(X > 18.307 | df=10) = 0.05
+    assert chi2_sf(3.841, 1) == pytest.approx(0.05, abs=0.005)
+    assert chi2_sf(18.307, 10) == pytest.approx(0.05, abs=0.002)
+
+
+def test_two_sample_p_value_detects_a_shift():
+    rng = np.random.default_rng(0)
+    same = two_sample_p_value(rng.poisson(5, 5000), rng.poisson(5, 5000))
+    shifted = two_sample_p_value(rng.poisson(5, 5000), rng.poisson(5.3, 5000))
+    assert same > MIN_P_VALUE
+    assert shifted < MIN_P_VALUE
@@ -0,0 +1,54 @@
+"""
+The compiled race kernel against BatchSimulator
+
+engine="compiled" falls back to BatchSimulator when Numba is missing, so
+these tests drive KernelSimulator directly: without Numba they run the
+kernel as plain Python, with it the compiled kernel. Either way it must
+return simulate_races' columns and dtypes and follow the same
+distributions as the NumPy engine.
+"""
+
+import numpy as np
+import pytest
+
+from simulators.atlanta_recalibrated import ATLANTA_DRIVERS, ATLANTA_MODEL
+from simulators.cota_simulator import COTA_DRIVERS, COTA_MODEL
+from simulators.engine import BatchSimulator
+from simulators.kernel import KernelSimulator
+
+N_RACES = 2000
+
+# Seeded runs, so a mean either always passes or always fails; this only
+# guards against a real difference, not against sampling noise
+MAX_Z = 4.0
+
+TRACKS = {
+    "atlanta": (ATLANTA_MODEL, ATLANTA_DRIVERS),
+    "cota": (COTA_MODEL, COTA_DRIVERS),
+}
+
+
+@pytest.fixture(scope="module", params=sorted(TRACKS))
+def batches(request):
+    model, drivers = TRACKS[request.param]
+    kernel = KernelSimulator(model, drivers, np.random.default_rng(2024)).simulate_races(N_RACES)
+    batch = BatchSimulator(model, drivers, np.random.default_rng(7)).simulate_races(N_RACES)
+    return request.param, kernel, batch
+
+
+def test_kernel_matches_batch_schema(batches):
+    track, kernel, batch = batches
+    assert list(kernel) == list(batch), track
+    for column in batch:
+        assert np.asarray(kernel[column]).dtype == np.asarray(batch[column]).dtype, f"{track} {column}"
+        assert len(kernel[column]) == N_RACES, f"{track} {column}"
+
+
+@pytest.mark.parametrize("column", ["total_cautions", "running_at_finish", "attrition_rate"])
+def test_kernel_matches_batch_means(batches, column):
+    track, kernel, batch = batches
+    a = np.asarray(kernel[column], dtype=float)
+    b = np.asarray(batch[column], dtype=float)
+    se = np.sqrt(a.var() / a.size + b.var() / b.size)
+    z = (a.mean() - b.mean()) / se
+    assert abs(z) < MAX_Z, f"{track} {column}: kernel {a.mean():.3f}, batch {b.mean():.3f}"
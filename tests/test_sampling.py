@@ -0,0 +1,119 @@
+"""
+sample_distinct against exact successive weighted sampling
+
+Drawing k victims one at a time, each in proportion to the weights still in
+the pool, gives every ordered sequence of picks a known probability; summing
+them over all sequences gives each item's exact inclusion probability.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from simulators.sampling import sample_distinct, sample_rows
+
+WEIGHTS = np.array([5.0, 3.0, 1.0, 0.5, 0.5])
+N_ROWS = 200_000
+
+
+def exact_sequences(weights: np.ndarray, k: int) -> dict:
+    """P(picks == seq) for every ordered k-sequence of successive weighted draws"""
+    probs = {}
+    for seq in itertools.permutations(range(len(weights)), k):
+        p, left = 1.0, weights.sum()
+        for i in seq:
+            p *= weights[i] / left
+            left -= weights[i]
+        probs[seq] = p
+    return probs
+
+
+def exact_inclusion(weights: np.ndarray, k: int) -> np.ndarray:
+    inclusion = np.zeros(len(weights))
+    for seq, p in exact_sequences(weights, k).items():
+        inclusion[list(seq)] += p
+    return inclusion
+
+
+def assert_close(observed: np.ndarray, exact: np.ndarray, n: int):
+    """Within 5 binomial standard errors"""
+    se = np.sqrt(exact * (1 - exact) / n)
+    assert np.all(np.abs(observed - exact) <= 5 * se + 1e-12), (observed, exact)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3])
+def test_inclusion_probabilities_match_exact(k):
+    rng = np.random.default_rng(12)
+    eligible = np.ones((N_ROWS, len(WEIGHTS)), dtype=bool)
+    picks, hit = sample_distinct(WEIGHTS, eligible, k, rng)
+
+    assert picks.shape == hit.shape == (N_ROWS, k)
+    assert hit.all()
+    inclusion = np.bincount(picks.ravel(), minlength=len(WEIGHTS)) / N_ROWS
+    assert_close(inclusion, exact_inclusion(WEIGHTS, k), N_ROWS)
+
+
+def test_draw_order_matches_successive_sampling():
+    rng = np.random.default_rng(3)
+    eligible = np.ones((N_ROWS, len(WEIGHTS)), dtype=bool)
+    picks, _ = sample_distinct(WEIGHTS, eligible, 2, rng)
+
+    exact = exact_sequences(WEIGHTS, 2)
+    codes = picks[:, 0] * len(WEIGHTS) + picks[:, 1]
+    observed = np.bincount(codes, minlength=len(WEIGHTS) ** 2) / N_ROWS
+    for (i, j), p in exact.items():
+        assert_close(observed[[i * len(WEIGHTS) + j]], np.array([p]), N_ROWS)
+
+
+def test_picks_are_distinct():
+    rng = np.random.default_rng(5)
+    weights = rng.uniform(0.1, 2.0, size=(1000, 12))
+    eligible = np.ones((1000, 12), dtype=bool)
+    picks, hit = sample_distinct(weights, eligible, 6, rng)
+
+    assert hit.all()
+    assert all(len(set(row)) == 6 for row in picks)
+
+
+def test_per_row_k():
+    rng = np.random.default_rng(8)
+    k = np.array([0, 1, 3, 5, 2])
+    eligible = np.ones((5, len(WEIGHTS)), dtype=bool)
+    picks, hit = sample_distinct(WEIGHTS, eligible, k, rng)
+
+    assert picks.shape == (5, 5)
+    np.testing.assert_array_equal(hit.sum(axis=1), k)
+    # The real draws come first in every row
+    np.testing.assert_array_equal(hit, np.arange(5) < k[:, None])
+
+
+def test_only_eligible_picked_and_fewer_eligible_than_k():
+    rng = np.random.default_rng(9)
+    eligible = np.array([
+        [True, False, True, False, False],   # 2 eligible, k = 4
+        [False, False, False, False, False],  # none
+        [True, True, True, True, True],
+    ])
+    picks, hit = sample_distinct(WEIGHTS, eligible, 4, rng)
+
+    np.testing.assert_array_equal(hit.sum(axis=1), [2, 0, 4])
+    for row in range(3):
+        chosen = picks[row][hit[row]]
+        assert eligible[row, chosen].all()
+        assert len(set(chosen)) == len(chosen)
+    assert set(picks[0][hit[0]]) == {0, 2}
+
+
+def test_no_picks():
+    rng = np.random.default_rng(1)
+    picks, hit = sample_distinct(WEIGHTS, np.ones((4, 5), dtype=bool), 0, rng)
+    assert picks.shape == hit.shape == (4, 0)
+
+
+def test_sample_rows_matches_weights():
+    rng = np.random.default_rng(4)
+    weights = np.tile(WEIGHTS, (N_ROWS, 1))
+    idx = sample_rows(weights, rng.random((N_ROWS, 1)))[:, 0]
+    observed = np.bincount(idx, minlength=len(WEIGHTS)) / N_ROWS
+    assert_close(observed, WEIGHTS / WEIGHTS.sum(), N_ROWS)
@@ -0,0 +1,102 @@
+"""
+The prediction service over HTTP on localhost
+
+Every test starts a PredictionService on a free port and talks to it with
+plain asyncio sockets.
+"""
+
+import asyncio
+import json
+
+from simulators.atlanta_recalibrated import run_atlanta_monte_carlo, summarize_atlanta_results
+from simulators.service import PredictionService
+
+SEED = 42
+CHUNK_SIZE = 2000
+
+
+async def get(port: int, path: str):
+    """(status, body bytes) of GET path"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), body
+
+
+def with_service(test):
+    """Run test(service) against a started service, then shut it down"""
+    async def main():
+        service = PredictionService(workers=1, seed=SEED, chunk_size=CHUNK_SIZE)
+        await service.start(port=0)
+        try:
+            return await test(service)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_health():
+    async def test(service):
+        status, body = await get(service.port, "/health")
+        assert status == 200
+        health = json.loads(body)
+        assert health['status'] == 'ok'
+        assert health['seed'] == SEED
+        assert health['in_flight'] == 0
+    with_service(test)
+
+
+def test_streamed_prediction():
+    async def test(service):
+        status, body = await get(service.port, "/predict/atlanta?n=6000&stream=1")
+        assert status == 200
+        return [json.loads(line) for line in body.splitlines()]
+    records = with_service(test)
+
+    partials, result = records[:-1], records[-1]
+    assert [r['event'] for r in partials] == ['partial'] * 3
+    assert [r['progress']['done'] for r in partials] == [2000, 4000, 6000]
+    assert all(r['wins'] for r in partials)
+    assert result['event'] == 'result'
+    assert result['source'] == 'run'
+    assert result['metadata']['n_simulations'] == 6000
+
+    # Chunks merged in order: the run_monte_carlo run of as many workers
+    acc = run_atlanta_monte_carlo(6000, engine="vectorized", seed=SEED, workers=3,
+                                  streaming=True, quiet=True)
+    expected = json.loads(json.dumps(summarize_atlanta_results(acc).to_dict(), default=str))
+    assert result['summary']['wins'] == expected['wins']
+
+
+def test_identical_requests_coalesce():
+    async def test(service):
+        path = "/predict/cota?n=20000"
+        first, second = await asyncio.gather(get(service.port, path), get(service.port, path))
+        again = await get(service.port, path)
+        return service.counts, [json.loads(body) for _, body in (first, second, again)]
+    counts, (first, second, again) = with_service(test)
+
+    assert counts['run'] == 1
+    assert counts['coalesced'] == 1
+    assert sorted([first['source'], second['source']]) == ['coalesced', 'run']
+    assert first['summary'] == second['summary']
+    assert again['source'] == 'memory'
+    assert again['summary'] == first['summary']
+
+
+def test_bad_requests():
+    async def test(service):
+        return {path: await get(service.port, path) for path in (
+            "/predict/atlanta?n=0", "/predict/atlanta?n=abc", "/predict/daytona",
+            "/predict/atlanta?engine=warp", "/nowhere",
+        )}
+    responses = with_service(test)
+
+    for path, (status, body) in responses.items():
+        assert status == (404 if path == "/nowhere" else 400), path
+        assert 'error' in json.loads(body)
+    assert b"daytona" in responses["/predict/daytona"][1]